@@ -1,27 +1,50 @@
 """Simple cookie-based password authentication."""
 
+import functools
 import hashlib
 import hmac
 import time
+from collections import OrderedDict
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import RedirectResponse
+from starlette.requests import cookie_parser
+from starlette.responses import RedirectResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
 
-# Routes that don't require authentication
-_PUBLIC_PATHS = {"/health", "/login"}
+# Routes that don't require authentication (exact matches) and static files
+_PUBLIC_PATHS = frozenset({"/health", "/login"})
+_STATIC_PREFIX = "/static/"
 
 _COOKIE_NAME = "icloud_session"
+_UNAUTHORIZED_BODY = b'{"detail":"Nicht authentifiziert."}'
 _SESSION_MAX_AGE = 86400 * 7  # 7 days
 
+# Cookie layout: 10-digit unix timestamp, ".", 64-char hex SHA-256 signature
+_TS_LEN = 10
+_SIG_LEN = 64
+_COOKIE_LEN = _TS_LEN + 1 + _SIG_LEN
+
+# Recently verified cookies → expiry timestamp, so repeat requests from the
+# same browser skip the HMAC computation entirely.
+_COOKIE_CACHE_SIZE = 4096
+_cookie_cache: "OrderedDict[str, float]" = OrderedDict()
+
+
+@functools.lru_cache(maxsize=1)
+def _prepared(secret: bytes) -> "hmac.HMAC":
+    """Return an HMAC template that has already absorbed *secret*.
+
+    Keyed on the secret so a changed key automatically yields a new template.
+    """
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
 
 def _sign(value: str) -> str:
     """Create an HMAC signature for the given value."""
-    return hmac.new(
-        settings.get_secret_key().encode(), value.encode(), hashlib.sha256
-    ).hexdigest()
+    h = _prepared(settings.secret_key_bytes).copy()
+    h.update(value.encode())
+    return h.hexdigest()
 
 
 def create_session_cookie() -> str:
@@ -33,36 +56,77 @@ def create_session_cookie() -> str:
 
 def verify_session_cookie(cookie: str) -> bool:
     """Verify a signed session cookie."""
-    try:
-        ts, sig = cookie.rsplit(".", 1)
-        if not hmac.compare_digest(sig, _sign(ts)):
-            return False
-        age = time.time() - int(ts)
-        return 0 <= age <= _SESSION_MAX_AGE
-    except (ValueError, TypeError):
+    expires_at = _cookie_cache.get(cookie)
+    if expires_at is not None:
+        if time.time() <= expires_at:
+            _cookie_cache.move_to_end(cookie)
+            return True
+        forget_session_cookie(cookie)
         return False
+    # Reject malformed cookies by shape before doing any hashing
+    if len(cookie) != _COOKIE_LEN or cookie[_TS_LEN] != "." or not cookie.isascii():
+        return False
+    ts = cookie[:_TS_LEN]
+    if not ts.isdigit():
+        return False
+    if not hmac.compare_digest(cookie[_TS_LEN + 1:], _sign(ts)):
+        return False
+    issued_at = int(ts)
+    age = time.time() - issued_at
+    if not 0 <= age <= _SESSION_MAX_AGE:
+        return False
+    _cookie_cache[cookie] = issued_at + _SESSION_MAX_AGE
+    if len(_cookie_cache) > _COOKIE_CACHE_SIZE:
+        _cookie_cache.popitem(last=False)
+    return True
+
 
+def forget_session_cookie(cookie: str) -> None:
+    """Drop *cookie* from the verification cache (e.g. on logout)."""
+    _cookie_cache.pop(cookie, None)
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Redirect unauthenticated requests to /login."""
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+def _session_cookie(headers: list[tuple[bytes, bytes]]) -> str | None:
+    """Return the session cookie from raw ASGI headers, if present."""
+    for name, value in headers:
+        if name == b"cookie":
+            return cookie_parser(value.decode("latin-1")).get(_COOKIE_NAME)
+    return None
+
+
+# Responses are stateless ASGI apps, so they can be built once and reused.
+_UNAUTHORIZED_RESPONSE = Response(_UNAUTHORIZED_BODY, status_code=401, media_type="application/json")
+_LOGIN_REDIRECT = RedirectResponse(url="/login", status_code=302)
+
+
+class AuthMiddleware:
+    """Redirect unauthenticated requests to /login.
+
+    Implemented as plain ASGI middleware to avoid the per-request task group
+    and body streaming of ``BaseHTTPMiddleware``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         # Allow public paths and static files
-        if path in _PUBLIC_PATHS or path.startswith("/static/"):
-            return await call_next(request)
+        if path in _PUBLIC_PATHS or path.startswith(_STATIC_PREFIX):
+            await self.app(scope, receive, send)
+            return
 
         # Check session cookie
-        cookie = request.cookies.get(_COOKIE_NAME)
+        cookie = _session_cookie(scope["headers"])
         if cookie and verify_session_cookie(cookie):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # API requests get 401, browser requests get redirect
-        if path.startswith("/api/"):
-            from starlette.responses import JSONResponse
-            return JSONResponse(
-                {"detail": "Nicht authentifiziert."}, status_code=401
-            )
-
-        return RedirectResponse(url="/login", status_code=302)
+        response = _UNAUTHORIZED_RESPONSE if path.startswith("/api/") else _LOGIN_REDIRECT
+        await response(scope, receive, send)
@@ -1,3 +1,4 @@
+import functools
 import secrets
 from pathlib import Path
 
@@ -20,6 +21,8 @@ class Settings(BaseSettings):
     pushover_api_token: str = ""
     pushover_user_key: str = ""
     pushover_devices: str = ""
+    backup_concurrency: int = 2
+    download_concurrency: int = 8
 
     model_config = {"env_prefix": ""}
 
@@ -48,5 +51,10 @@ class Settings(BaseSettings):
             return self.secret_key
         return self.get_auth_password()
 
+    @functools.cached_property
+    def secret_key_bytes(self) -> bytes:
+        """UTF-8 encoded :meth:`get_secret_key`, resolved once per process."""
+        return self.get_secret_key().encode()
+
 
 settings = Settings()
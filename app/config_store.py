@@ -1,67 +1,209 @@
-"""YAML-based configuration store for accounts and backup configs.
+"""JSON-based configuration store for accounts and backup configs.
 
 Replaces the SQLite/SQLAlchemy persistence layer with a simple
-human-readable YAML file at /config/config.yaml.
+human-readable JSON file at /config/config.json.  Installations that
+still have the former /config/config.yaml are migrated on first read.
 """
 
+import copy
 import enum
+import functools
 import logging
+import os
 import re
+import tempfile
 import threading
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from app.config import settings
 
 log = logging.getLogger("icloud-backup")
 
 
-_lock = threading.Lock()
-_CONFIG_FILE: Path = settings.config_path / "config.yaml"
+# Writers hold _lock for the whole read-modify-write cycle.  Readers go
+# through _snapshot(), which only takes it when the cache must be refreshed.
+_lock = threading.RLock()
+_CONFIG_FILE: Path = settings.config_path / "config.json"
+
+# Last parsed config plus its ``apple_id → account`` index, keyed by the
+# file's identity (path, inode, mtime, size) so unchanged files are not
+# re-read.  Guarded by _lock.
+_cache: tuple[tuple, dict, dict[str, dict]] | None = None
+
+# Status files by path.  They are only written through _write_status(), so
+# polling the backup status is served from memory after the first read.
+_status_cache: dict[Path, dict] = {}
+
+# Directories already created by _write_atomic, so persisting does not pay a
+# mkdir syscall on every status update.
+_ready_dirs: set[Path] = set()
+
+# !!python/ tags that yaml.dump() wrote for enum/object values in the legacy
+# YAML config; yaml.safe_load cannot handle them.
+_PY_TAG_RE = re.compile(r"!!python/\S+\n\s*- ")
 
 
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _read_legacy_yaml(path: Path) -> dict:
+    """Read the pre-JSON ``config.yaml`` format."""
+    text = _PY_TAG_RE.sub("", path.read_text())
+    return yaml.load(text, Loader=_YamlLoader) or {}
+
+
+def _migrate_legacy_yaml() -> dict:
+    """Import a former ``config.yaml`` next to the JSON config, if present."""
+    legacy = _CONFIG_FILE.with_suffix(".yaml")
+    if not legacy.exists():
+        return {}
+    try:
+        data = _read_legacy_yaml(legacy)
+    except Exception:
+        log.error("Fehler beim Lesen der Konfigurationsdatei %s", legacy, exc_info=True)
+        return {}
+    data.setdefault("accounts", [])
+    _write(data)
+    log.info("Konfiguration von %s nach %s migriert", legacy.name, _CONFIG_FILE.name)
+    return data
+
+
+def _file_key() -> tuple | None:
+    try:
+        st = _CONFIG_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (str(_CONFIG_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def _read() -> dict:
-    """Read the YAML config file and return its contents as a dict."""
-    if not _CONFIG_FILE.exists():
-        return {"accounts": []}
+    """Return the parsed JSON config, re-reading the file only when it changed.
+
+    The returned dict is shared with the in-memory cache and must be treated
+    as read-only; code that mutates the config uses :func:`_read_for_update`.
+    """
+    global _cache
+    key = _file_key()
+    if key is None:
+        data = _migrate_legacy_yaml()
+        data.setdefault("accounts", [])
+        return data
+    if _cache is not None and _cache[0] == key:
+        return _cache[1]
     try:
-        text = _CONFIG_FILE.read_text()
-        # Strip !!python/ tags that yaml.safe_load cannot handle.
-        # These are written by yaml.dump() for enum/object values.
-        text = re.sub(r"!!python/\S+\n\s*- ", "", text)
-        data = yaml.safe_load(text) or {}
+        data = orjson.loads(_CONFIG_FILE.read_bytes()) or {}
     except Exception:
         log.error("Fehler beim Lesen der Konfigurationsdatei %s", _CONFIG_FILE, exc_info=True)
         data = {}
     if "accounts" not in data:
         data["accounts"] = []
+    _backfill_drive_folders(data)
+    _cache = (key, data, _build_index(data))
     return data
 
 
+def _backfill_drive_folders(data: dict) -> None:
+    """Resolve ``drive_folders`` for backups saved before it was stored."""
+    for acc in data["accounts"]:
+        backup = acc.get("backup")
+        if backup is not None and "drive_folders" not in backup:
+            backup["drive_folders"] = _split_drive_folders(backup)
+
+
+def _snapshot() -> tuple[dict, dict[str, dict]]:
+    """Return ``(data, index)`` of the current config for read-only use.
+
+    On a cache hit no lock is taken: the cache tuple is swapped atomically by
+    writers, so readers always see a consistent (old or new) version.
+    """
+    cached = _cache
+    if cached is not None and cached[0] == _file_key():
+        return cached[1], cached[2]
+    with _lock:
+        data = _read()
+        cached = _cache
+        if cached is not None and cached[1] is data:
+            return data, cached[2]
+        return data, _build_index(data)
+
+
+def _read_for_update() -> dict:
+    """Return a private deep copy of the config that the caller may mutate."""
+    return orjson.loads(orjson.dumps(_read()))
+
+
+def _walk(obj):
+    """Yield ``(container, key, value)`` for every nested dict/list entry."""
+    items = obj.items() if isinstance(obj, dict) else enumerate(obj) if isinstance(obj, list) else ()
+    for key, value in items:
+        yield obj, key, value
+        yield from _walk(value)
+
+
 def _sanitize(obj):
-    """Recursively convert enum values to plain strings for YAML serialization."""
-    if isinstance(obj, dict):
-        return {k: _sanitize(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitize(v) for v in obj]
-    if isinstance(obj, enum.Enum):
-        return obj.value
+    """Convert enum values to plain strings for serialization.
+
+    Enum-free data (the common case) is returned as is; otherwise a deep
+    copy is flattened in place so callers' objects stay untouched.
+    """
+    if not any(isinstance(value, enum.Enum) for _, _, value in _walk(obj)):
+        return obj
+    obj = copy.deepcopy(obj)
+    for container, key, value in _walk(obj):
+        if isinstance(value, enum.Enum):
+            container[key] = value.value
     return obj
 
 
+def _write_atomic(path: Path, payload: bytes) -> None:
+    """Write *payload* to *path* via a unique temp file, fsync and rename."""
+    if path.parent not in _ready_dirs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ready_dirs.add(path.parent)
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=path.parent)
+    except FileNotFoundError:
+        # Directory removed behind our back – recreate it once.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=path.parent)
+    try:
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates 0600
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 def _write(data: dict) -> None:
-    """Atomically write *data* to the YAML config file."""
-    _CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    tmp = _CONFIG_FILE.with_suffix(".yaml.tmp")
+    """Atomically write *data* to the JSON config file."""
+    global _cache
     clean = _sanitize(data)
-    tmp.write_text(yaml.safe_dump(clean, default_flow_style=False, allow_unicode=True, sort_keys=False))
-    tmp.rename(_CONFIG_FILE)
+    # Nothing changed since the last read/write of an unmodified file.
+    if _cache is not None and _cache[1] == clean and _cache[0] == _file_key():
+        return
+    _write_atomic(_CONFIG_FILE, orjson.dumps(clean, option=orjson.OPT_INDENT_2))
+    key = _file_key()
+    _cache = (key, clean, _build_index(clean)) if key is not None else None
+
+
+def _build_index(data: dict) -> dict[str, dict]:
+    return {acc["apple_id"]: acc for acc in data["accounts"]}
 
 
 def _find_account(data: dict, apple_id: str) -> dict | None:
@@ -87,6 +229,21 @@ def _default_backup() -> dict:
         "photos_sync_policy": "keep",
         "exclusions": None,
         "destination": "",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Backup status files
+#
+# The last-run status changes on every backup while the structural config
+# only changes on user edits, so status lives in one small JSON file per
+# account under <config_path>/status/ instead of in config.json.  Configs
+# written by older versions may still carry these keys inside "backup";
+# the status file takes precedence once it exists.
+# ---------------------------------------------------------------------------
+
+def _default_status() -> dict:
+    return {
         "last_backup_status": "idle",
         "last_backup_at": None,
         "last_backup_started_at": None,
@@ -96,6 +253,49 @@ def _default_backup() -> dict:
     }
 
 
+def _status_path(apple_id: str) -> Path:
+    return _CONFIG_FILE.parent / "status" / f"{quote(apple_id, safe='@._-')}.json"
+
+
+def _read_status(apple_id: str) -> dict:
+    """Return the persisted status overrides for *apple_id* (may be empty).
+
+    The result is shared with the status cache and must not be mutated.
+    """
+    path = _status_path(apple_id)
+    status = _status_cache.get(path)
+    if status is not None:
+        return status
+    try:
+        status = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        status = {}
+    except Exception:
+        log.warning("Status-Datei beschädigt, wird ignoriert: %s", path)
+        status = {}
+    _status_cache[path] = status
+    return status
+
+
+def _write_status(apple_id: str, status: dict) -> None:
+    # Only final results reach the disk ("running" stays in memory), and a
+    # lost final status could not be repaired, so the write is fsynced.
+    path = _status_path(apple_id)
+    _write_atomic(path, orjson.dumps(status, option=orjson.OPT_INDENT_2))
+    _status_cache[path] = status
+
+
+def _merged_backup(acc: dict) -> dict:
+    """Combine an account's backup config with its persisted status."""
+    backup = acc.get("backup") or _default_backup()
+    return {
+        **_default_status(),
+        **backup,
+        **_read_status(acc["apple_id"]),
+        "apple_id": acc["apple_id"],
+    }
+
+
 def _default_schedule() -> dict:
     return {
         "enabled": False,
@@ -107,26 +307,7 @@ def _default_schedule() -> dict:
 # Public API – accounts
 # ---------------------------------------------------------------------------
 
-def list_accounts() -> list[dict]:
-    with _lock:
-        data = _read()
-    return [
-        {
-            "apple_id": acc["apple_id"],
-            "status": acc.get("status", "pending"),
-            "status_message": acc.get("status_message"),
-            "last_token_refresh_at": acc.get("last_token_refresh_at"),
-        }
-        for acc in data["accounts"]
-    ]
-
-
-def get_account(apple_id: str) -> dict | None:
-    with _lock:
-        data = _read()
-        acc = _find_account(data, apple_id)
-    if acc is None:
-        return None
+def _account_view(acc: dict) -> dict:
     return {
         "apple_id": acc["apple_id"],
         "status": acc.get("status", "pending"),
@@ -135,6 +316,26 @@ def get_account(apple_id: str) -> dict | None:
     }
 
 
+def list_accounts() -> list[dict]:
+    data, _ = _snapshot()
+    return [_account_view(acc) for acc in data["accounts"]]
+
+
+def get_account(apple_id: str) -> dict | None:
+    acc = _snapshot()[1].get(apple_id)
+    if acc is None:
+        return None
+    return _account_view(acc)
+
+
+def get_account_with_config(apple_id: str) -> tuple[dict | None, dict | None]:
+    """Return the account and its backup config from a single snapshot lookup."""
+    acc = _snapshot()[1].get(apple_id)
+    if acc is None:
+        return None, None
+    return _account_view(acc), _merged_backup(acc)
+
+
 def add_account(
     apple_id: str,
     status: str = "pending",
@@ -142,9 +343,9 @@ def add_account(
     token_refreshed: bool = False,
 ) -> dict:
     with _lock:
-        data = _read()
-        if _find_account(data, apple_id) is not None:
+        if apple_id in _snapshot()[1]:
             raise ValueError("Account existiert bereits.")
+        data = _read_for_update()
         acc = {
             "apple_id": apple_id,
             "status": status,
@@ -169,7 +370,7 @@ def update_account_status(
     token_refreshed: bool = False,
 ) -> dict | None:
     with _lock:
-        data = _read()
+        data = _read_for_update()
         acc = _find_account(data, apple_id)
         if acc is None:
             return None
@@ -188,12 +389,15 @@ def update_account_status(
 
 def delete_account(apple_id: str) -> bool:
     with _lock:
-        data = _read()
+        data = _read_for_update()
         before = len(data["accounts"])
         data["accounts"] = [a for a in data["accounts"] if a["apple_id"] != apple_id]
         if len(data["accounts"]) == before:
             return False
         _write(data)
+        path = _status_path(apple_id)
+        path.unlink(missing_ok=True)
+        _status_cache.pop(path, None)
     return True
 
 
@@ -202,18 +406,21 @@ def delete_account(apple_id: str) -> bool:
 # ---------------------------------------------------------------------------
 
 def get_backup_config(apple_id: str) -> dict | None:
-    with _lock:
-        data = _read()
-        acc = _find_account(data, apple_id)
+    acc = _snapshot()[1].get(apple_id)
     if acc is None:
         return None
-    backup = acc.get("backup") or _default_backup()
-    return {**backup, "apple_id": apple_id}
+    return _merged_backup(acc)
+
+
+def list_backup_configs() -> dict[str, dict]:
+    """Return the backup config of every account, keyed by apple_id."""
+    data, _ = _snapshot()
+    return {acc["apple_id"]: _merged_backup(acc) for acc in data["accounts"]}
 
 
 def save_backup_config(apple_id: str, config: dict) -> dict | None:
     with _lock:
-        data = _read()
+        data = _read_for_update()
         acc = _find_account(data, apple_id)
         if acc is None:
             return None
@@ -232,9 +439,36 @@ def save_backup_config(apple_id: str, config: dict) -> dict | None:
                 acc["backup"][key] = config[key]
         # Auto-generate destination if empty
         if not acc["backup"].get("destination"):
-            acc["backup"]["destination"] = apple_id.replace("@", "_at_").replace(".", "_")
+            acc["backup"]["destination"] = default_destination(apple_id)
+        # Resolve the folder list once here instead of on every backup run
+        acc["backup"]["drive_folders"] = _split_drive_folders(acc["backup"])
         _write(data)
-    return {**acc["backup"], "apple_id": apple_id}
+    return _merged_backup(acc)
+
+
+@functools.lru_cache(maxsize=256)
+def default_destination(apple_id: str) -> str:
+    """Return the backup folder name used when no destination is configured."""
+    return apple_id.replace("@", "_at_").replace(".", "_")
+
+
+def _split_drive_folders(cfg: dict) -> list[str]:
+    if cfg.get("drive_config_mode", "simple") == "simple":
+        return cfg.get("drive_folders_simple") or []
+    # Advanced mode: one path per line
+    text = cfg.get("drive_folders_advanced") or ""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def drive_folders(cfg: dict) -> list[str]:
+    """Return the Drive folders to back up for a backup config dict.
+
+    Uses the list resolved by save_backup_config(), which _read() also
+    backfills for configs saved by older versions; other dicts are parsed
+    on the fly.
+    """
+    folders = cfg.get("drive_folders")
+    return folders if folders is not None else _split_drive_folders(cfg)
 
 
 def update_backup_status(
@@ -245,26 +479,51 @@ def update_backup_status(
     at: str | None = None,
     started_at: str | None = None,
     duration_seconds: int | None = None,
+    *,
+    persist: bool = True,
 ) -> None:
+    """Update the backup status of *apple_id*.
+
+    With *persist* unset the change only lands in the in-memory status
+    cache; the next persisted update writes it out together with its own.
+    """
     with _lock:
-        data = _read()
-        acc = _find_account(data, apple_id)
+        acc = _snapshot()[1].get(apple_id)
         if acc is None:
             return
-        if "backup" not in acc:
-            acc["backup"] = _default_backup()
-        acc["backup"]["last_backup_status"] = status
+        current = _merged_backup(acc)
+        updated = {key: current[key] for key in _default_status()}
+        updated["last_backup_status"] = status
         if message is not None:
-            acc["backup"]["last_backup_message"] = message
+            updated["last_backup_message"] = message
         if stats is not None:
-            acc["backup"]["last_backup_stats"] = stats
+            updated["last_backup_stats"] = stats
         if at is not None:
-            acc["backup"]["last_backup_at"] = at
+            updated["last_backup_at"] = at
         if started_at is not None:
-            acc["backup"]["last_backup_started_at"] = started_at
+            updated["last_backup_started_at"] = started_at
         if duration_seconds is not None:
-            acc["backup"]["last_backup_duration_seconds"] = duration_seconds
-        _write(data)
+            updated["last_backup_duration_seconds"] = duration_seconds
+        if persist:
+            _write_status(apple_id, _sanitize(updated))
+        else:
+            _status_cache[_status_path(apple_id)] = _sanitize(updated)
+
+
+def mark_running(apple_id: str, started_at: str) -> None:
+    """Set *apple_id* to ``running`` in memory only.
+
+    The terminal status written when the backup finishes persists the start
+    time along with it, so a backup costs one status write instead of two.
+    """
+    update_backup_status(apple_id, status="running", started_at=started_at, persist=False)
+
+
+def mark_backups_running(apple_ids: list[str], started_at: str) -> None:
+    """Set several accounts to ``running`` under a single lock acquisition."""
+    with _lock:
+        for apple_id in apple_ids:
+            mark_running(apple_id, started_at)
 
 
 # ---------------------------------------------------------------------------
@@ -279,16 +538,14 @@ def reset_stale_running_states() -> int:
     """
     count = 0
     with _lock:
-        data = _read()
+        data, _ = _snapshot()
         for acc in data["accounts"]:
-            backup = acc.get("backup") or {}
-            if backup.get("last_backup_status") == "running":
-                backup["last_backup_status"] = "error"
-                backup["last_backup_message"] = "Backup durch Neustart unterbrochen."
-                acc["backup"] = backup
+            if _merged_backup(acc)["last_backup_status"] == "running":
+                update_backup_status(
+                    acc["apple_id"], status="error",
+                    message="Backup durch Neustart unterbrochen.",
+                )
                 count += 1
-        if count:
-            _write(data)
     return count
 
 
@@ -298,51 +555,64 @@ def reset_stale_running_states() -> int:
 
 def get_schedule() -> dict:
     """Return the global backup schedule settings."""
-    with _lock:
-        data = _read()
+    data, _ = _snapshot()
     return data.get("schedule") or _default_schedule()
 
 
 def save_schedule(enabled: bool, cron: str) -> dict:
     """Save the global backup schedule settings."""
     with _lock:
-        data = _read()
+        data = _read_for_update()
         data["schedule"] = {"enabled": enabled, "cron": cron}
         _write(data)
     return data["schedule"]
 
 
+def _backup_enabled(backup: dict) -> bool:
+    return bool(
+        backup.get("backup_drive") or backup.get("backup_photos")
+        or backup.get("backup_contacts") or backup.get("backup_calendar")
+    )
+
+
 def list_configured_accounts() -> list[dict]:
     """Return all accounts that have a backup configuration (drive or photos enabled)."""
-    with _lock:
-        data = _read()
+    data, _ = _snapshot()
     result = []
     for acc in data["accounts"]:
-        backup = acc.get("backup") or {}
-        if backup.get("backup_drive") or backup.get("backup_photos") or backup.get("backup_contacts") or backup.get("backup_calendar"):
+        if _backup_enabled(acc.get("backup") or {}):
             result.append({
-                "apple_id": acc["apple_id"],
                 "status": acc.get("status", "pending"),
-                **backup,
+                **_merged_backup(acc),
             })
     return result
 
 
-def get_shared_library_owner(shared_library_id: str, exclude_apple_id: str | None = None) -> str | None:
-    """Return the apple_id of the account that has *shared_library_id* configured.
+def list_runnable_accounts() -> list[dict]:
+    """Return the configured accounts that are authenticated, in one pass over the store."""
+    data, _ = _snapshot()
+    return [
+        {"status": "authenticated", **_merged_backup(acc)}
+        for acc in data["accounts"]
+        if acc.get("status") == "authenticated" and _backup_enabled(acc.get("backup") or {})
+    ]
+
 
-    Returns ``None`` if no other account claims this shared library.
-    *exclude_apple_id* is typically the account being edited (don't flag yourself).
+def get_shared_library_owners(exclude_apple_id: str | None = None) -> dict[str, str]:
+    """Map each claimed shared library id to the apple_id backing it up.
+
+    A shared library is claimed by an account that includes family photos
+    with that library selected.  *exclude_apple_id* is typically the account
+    being edited (don't flag yourself).  The first claiming account wins.
     """
-    with _lock:
-        data = _read()
+    owners: dict[str, str] = {}
+    data, _ = _snapshot()
     for acc in data["accounts"]:
         if acc["apple_id"] == exclude_apple_id:
             continue
         backup = acc.get("backup") or {}
-        if (
-            backup.get("photos_include_family")
-            and backup.get("shared_library_id") == shared_library_id
-        ):
-            return acc["apple_id"]
-    return None
+        library_id = backup.get("shared_library_id")
+        if backup.get("photos_include_family") and library_id:
+            owners.setdefault(library_id, acc["apple_id"])
+    return owners
+
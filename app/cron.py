@@ -0,0 +1,21 @@
+"""Crontab expression parsing shared by the scheduler and the API schemas."""
+
+from apscheduler.triggers.cron import CronTrigger
+
+
+def cron_trigger(cron_expr: str) -> CronTrigger:
+    """Build a CronTrigger from a crontab-style expression.
+
+    Missing trailing fields fall back to "0 2 * * *"; invalid fields raise
+    ValueError.
+    """
+    parts = cron_expr.split()
+    if len(parts) > 5:
+        raise ValueError("Cron-Ausdruck hat mehr als 5 Felder")
+    return CronTrigger(
+        minute=parts[0] if len(parts) > 0 else "0",
+        hour=parts[1] if len(parts) > 1 else "2",
+        day=parts[2] if len(parts) > 2 else "*",
+        month=parts[3] if len(parts) > 3 else "*",
+        day_of_week=parts[4] if len(parts) > 4 else "*",
+    )
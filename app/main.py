@@ -3,18 +3,21 @@
 import hmac
 import logging
 import os
+from collections.abc import Mapping
 from contextlib import asynccontextmanager
 from pathlib import Path
+from types import MappingProxyType
 
 from fastapi import FastAPI, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.auth import AuthMiddleware, _COOKIE_NAME, create_session_cookie
+from app.auth import AuthMiddleware, _COOKIE_NAME, create_session_cookie, forget_session_cookie
 from app import config_store
 from app.config import settings
 from app.routers import accounts, backup
+from app.routers.deps import json_response
 from app.services.log_handler import log_buffer
 from app.services.scheduler import start_scheduler, stop_scheduler, sync_scheduled_jobs
 
@@ -33,8 +36,12 @@ class _HealthCheckFilter(logging.Filter):
     """Suppress noisy 'GET /health' access-log entries from uvicorn."""
 
     def filter(self, record: logging.LogRecord) -> bool:
-        msg = record.getMessage()
-        return "GET /health" not in msg
+        # uvicorn logs (client, method, path, http_version, status) as args;
+        # check those directly instead of %-formatting every record.
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5:
+            return not (args[1] == "GET" and str(args[2]).startswith("/health"))
+        return "GET /health" not in record.getMessage()
 
 
 logging.getLogger("uvicorn.access").addFilter(_HealthCheckFilter())
@@ -46,13 +53,12 @@ root_logger.addHandler(log_buffer)
 log = logging.getLogger("icloud-backup")
 
 
-def _build_info() -> dict[str, str]:
-    """Return build metadata injected at image build time."""
-    return {
-        "version": os.getenv("APP_VERSION", "dev"),
-        "commit": os.getenv("APP_COMMIT", "unknown"),
-        "build_date": os.getenv("APP_BUILD_DATE", "unknown"),
-    }
+# Build metadata injected at image build time; read-only after import.
+_BUILD_INFO: Mapping[str, str] = MappingProxyType({
+    "version": os.getenv("APP_VERSION", "dev"),
+    "commit": os.getenv("APP_COMMIT", "unknown"),
+    "build_date": os.getenv("APP_BUILD_DATE", "unknown"),
+})
 
 # ---------------------------------------------------------------------------
 # Lifespan
@@ -75,7 +81,7 @@ async def lifespan(app: FastAPI):
             "Kein AUTH_PASSWORD gesetzt. Generiertes Passwort: %s",
             settings.get_auth_password(),
         )
-    build = _build_info()
+    build = _BUILD_INFO
     log.info(
         "iCloud Backup Service gestartet (version=%s, commit=%s, build_date=%s)",
         build["version"],
@@ -119,7 +125,7 @@ app.include_router(backup.router)
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
-    return {"status": "ok", "build": _build_info()}
+    return {"status": "ok", "build": _BUILD_INFO}
 
 
 # ---------------------------------------------------------------------------
@@ -128,7 +134,7 @@ async def health():
 @app.get("/api/logs")
 async def get_logs(after: int = 0, limit: int = 200):
     """Return recent log entries (for polling-based log viewer)."""
-    return log_buffer.get_entries(after_id=after, limit=limit)
+    return json_response(log_buffer.get_entries(after_id=after, limit=limit))
 
 
 # ---------------------------------------------------------------------------
@@ -141,8 +147,8 @@ async def get_backup_progress(apple_id: str):
 
     progress = get_progress(apple_id)
     if progress is None:
-        return {"running": False}
-    return {"running": True, **progress}
+        return json_response({"running": False})
+    return json_response({"running": True, **progress})
 
 
 # ---------------------------------------------------------------------------
@@ -171,7 +177,10 @@ async def login_submit(request: Request, password: str = Form(...)):
 
 
 @app.post("/logout")
-async def logout():
+async def logout(request: Request):
+    cookie = request.cookies.get(_COOKIE_NAME)
+    if cookie:
+        forget_session_cookie(cookie)
     response = RedirectResponse(url="/login", status_code=302)
     response.delete_cookie(_COOKIE_NAME)
     return response
@@ -183,7 +192,7 @@ async def logout():
 @app.get("/")
 async def index(request: Request):
     return templates.TemplateResponse(
-        "index.html", {"request": request, "build": _build_info()}
+        "index.html", {"request": request, "build": _BUILD_INFO}
     )
 
 
@@ -191,10 +200,10 @@ async def index(request: Request):
 async def account_detail(request: Request, apple_id: str):
     return templates.TemplateResponse(
         "account_detail.html",
-        {"request": request, "apple_id": apple_id, "build": _build_info()},
+        {"request": request, "apple_id": apple_id, "build": _BUILD_INFO},
     )
 
 
 @app.get("/logs")
 async def logs_page(request: Request):
-    return templates.TemplateResponse("logs.html", {"request": request, "build": _build_info()})
+    return templates.TemplateResponse("logs.html", {"request": request, "build": _BUILD_INFO})
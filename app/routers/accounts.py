@@ -1,10 +1,14 @@
 """API routes for iCloud account management."""
 
+import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import APIRouter, HTTPException
 
 from app import config_store
+from app.routers.deps import ACCOUNT_NOT_FOUND, require_account
 from app.schemas import AccountCreate, AccountResponse, ReconnectRequest, SmsSendRequest, TwoFactorSubmit, TwoStepSubmit
 from app.services import icloud_service
 from app.services.notification import notify_token_expired
@@ -12,6 +16,26 @@ from app.services.notification import notify_token_expired
 log = logging.getLogger("icloud-backup")
 router = APIRouter(prefix="/api/accounts", tags=["accounts"])
 
+# pyicloud calls block on network I/O to Apple; run them on a dedicated,
+# bounded pool so they neither stall the event loop nor flood Apple.
+_icloud_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="icloud")
+
+
+async def _icloud(func, *args, **kwargs):
+    """Run a blocking icloud_service call off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_icloud_executor, functools.partial(func, *args, **kwargs))
+
+
+def _apply_auth_result(apple_id: str, result: dict) -> dict | None:
+    """Persist the status of an icloud_service auth result for *apple_id*."""
+    return config_store.update_account_status(
+        apple_id,
+        status=result["status"],
+        status_message=result["message"],
+        token_refreshed=(result["status"] == "authenticated"),
+    )
+
 
 @router.get("", response_model=list[AccountResponse])
 async def list_accounts():
@@ -19,17 +43,13 @@ async def list_accounts():
 
 
 @router.get("/storage-stats")
-async def storage_stats():
+async def storage_stats() -> dict[str, dict]:
     """Return cached storage stats (file counts + sizes) per account, split by photos/drive.
 
     Stats are computed after each successful backup and stored in the config.
     """
     result = {}
-    for acc_data in config_store.list_accounts():
-        apple_id = acc_data["apple_id"]
-        cfg = config_store.get_backup_config(apple_id)
-        if cfg is None:
-            continue
+    for apple_id, cfg in config_store.list_backup_configs().items():
         last_stats = cfg.get("last_backup_stats") or {}
         storage = last_stats.get("storage")
         if storage:
@@ -44,7 +64,7 @@ async def add_account(data: AccountCreate):
         raise HTTPException(status_code=400, detail="Account existiert bereits.")
 
     # Attempt authentication (password is only used here, not stored)
-    auth_result = icloud_service.authenticate(data.apple_id, data.password)
+    auth_result = await _icloud(icloud_service.authenticate, data.apple_id, data.password)
 
     status = auth_result["status"]
     message = auth_result["message"]
@@ -64,102 +84,70 @@ async def add_account(data: AccountCreate):
 
 @router.post("/{apple_id}/2fa", response_model=AccountResponse)
 async def submit_2fa(apple_id: str, data: TwoFactorSubmit):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+    require_account(apple_id)
 
-    result = icloud_service.submit_2fa_code(apple_id, data.code)
+    result = await _icloud(icloud_service.submit_2fa_code, apple_id, data.code)
 
-    updated = config_store.update_account_status(
-        apple_id,
-        status=result["status"],
-        status_message=result["message"],
-        token_refreshed=(result["status"] == "authenticated"),
-    )
+    updated = _apply_auth_result(apple_id, result)
     return updated
 
 
 @router.get("/{apple_id}/2fa/devices")
-async def get_trusted_devices(apple_id: str):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+async def get_trusted_devices(apple_id: str) -> list[dict]:
+    require_account(apple_id)
 
-    devices = icloud_service.get_trusted_devices(apple_id)
+    devices = await _icloud(icloud_service.get_trusted_devices, apple_id)
     return devices
 
 
 @router.post("/{apple_id}/2fa/push")
-async def request_2fa_push(apple_id: str, body: ReconnectRequest | None = None):
+async def request_2fa_push(apple_id: str, body: ReconnectRequest | None = None) -> dict:
     """Re-trigger 2FA push notification by forcing a fresh authentication."""
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+    require_account(apple_id)
 
     password = body.password if body else None
-    result = icloud_service.request_2fa_push(apple_id, password=password)
+    result = await _icloud(icloud_service.request_2fa_push, apple_id, password=password)
 
     # Update account status if auth state changed
     if result.get("status"):
-        config_store.update_account_status(
-            apple_id,
-            status=result["status"],
-            status_message=result["message"],
-            token_refreshed=(result["status"] == "authenticated"),
-        )
+        _apply_auth_result(apple_id, result)
 
     return result
 
 
 @router.post("/{apple_id}/2fa/sms")
-async def send_sms_code(apple_id: str, data: SmsSendRequest):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+async def send_sms_code(apple_id: str, data: SmsSendRequest) -> dict:
+    require_account(apple_id)
 
-    result = icloud_service.send_sms_code(apple_id, data.device_index)
+    result = await _icloud(icloud_service.send_sms_code, apple_id, data.device_index)
     return result
 
 
 @router.post("/{apple_id}/2sa", response_model=AccountResponse)
 async def submit_2sa(apple_id: str, data: TwoStepSubmit):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+    require_account(apple_id)
 
-    result = icloud_service.submit_2sa_code(apple_id, data.device_index, data.code)
+    result = await _icloud(icloud_service.submit_2sa_code, apple_id, data.device_index, data.code)
 
-    updated = config_store.update_account_status(
-        apple_id,
-        status=result["status"],
-        status_message=result["message"],
-        token_refreshed=(result["status"] == "authenticated"),
-    )
+    updated = _apply_auth_result(apple_id, result)
     return updated
 
 
 @router.post("/{apple_id}/reconnect")
-async def reconnect_account(apple_id: str, body: ReconnectRequest | None = None):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+async def reconnect_account(apple_id: str, body: ReconnectRequest | None = None) -> dict:
+    require_account(apple_id)
 
     password = body.password if body else None
 
-    auth_result = icloud_service.authenticate(apple_id, password=password)
+    auth_result = await _icloud(icloud_service.authenticate, apple_id, password=password)
 
     # If 2FA is needed, explicitly request Apple to send a push notification
     if auth_result["status"] == "requires_2fa":
         api = icloud_service._sessions.get(apple_id)
         if api:
-            icloud_service._request_device_push(api)
+            await _icloud(icloud_service._request_device_push, api)
 
-    updated = config_store.update_account_status(
-        apple_id,
-        status=auth_result["status"],
-        status_message=auth_result["message"],
-        token_refreshed=(auth_result["status"] == "authenticated"),
-    )
+    updated = _apply_auth_result(apple_id, auth_result)
     result = dict(updated)
     if auth_result.get("requires_password"):
         result["requires_password"] = True
@@ -167,92 +155,68 @@ async def reconnect_account(apple_id: str, body: ReconnectRequest | None = None)
 
 
 @router.post("/{apple_id}/check-connection")
-async def check_connection(apple_id: str):
+async def check_connection(apple_id: str) -> dict:
     """Check whether the iCloud session token is still valid.
 
     Performs a lightweight reconnect + API call to verify the session.
     Updates the account status accordingly.
     """
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+    require_account(apple_id)
 
-    result = icloud_service.check_connection(apple_id)
+    result = await _icloud(icloud_service.check_connection, apple_id)
 
     if result["valid"]:
-        config_store.update_account_status(
-            apple_id,
-            status="authenticated",
-            status_message=result["message"],
-        )
+        status = "authenticated"
     elif result["requires_2fa"]:
-        config_store.update_account_status(
-            apple_id,
-            status="requires_2fa",
-            status_message=result["message"],
-        )
-        notify_token_expired(apple_id)
+        status = "requires_2fa"
     else:
-        config_store.update_account_status(
-            apple_id,
-            status="error",
-            status_message=result["message"],
-        )
+        status = "error"
+    config_store.update_account_status(apple_id, status=status, status_message=result["message"])
+    if status == "requires_2fa":
+        notify_token_expired(apple_id)
 
     return result
 
 
 @router.get("/{apple_id}/icloud-storage")
-async def get_icloud_storage(apple_id: str):
+async def get_icloud_storage(apple_id: str) -> dict:
     """Return iCloud storage quota and per-media usage."""
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
-    if account["status"] != "authenticated":
-        raise HTTPException(status_code=400, detail="Account nicht authentifiziert.")
+    require_account(apple_id, authenticated=True)
 
-    data = icloud_service.get_storage_usage(apple_id)
+    data = await _icloud(icloud_service.get_storage_usage, apple_id)
     if data is None:
         raise HTTPException(status_code=503, detail="Speicherinfo nicht verfügbar.")
     return data
 
 
 @router.delete("/{apple_id}")
-async def delete_account(apple_id: str):
+async def delete_account(apple_id: str) -> dict[str, str]:
     if not config_store.delete_account(apple_id):
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+        raise HTTPException(status_code=404, detail=ACCOUNT_NOT_FOUND)
 
-    icloud_service.disconnect(apple_id)
+    await _icloud(icloud_service.disconnect, apple_id)
     return {"message": "Account gelöscht."}
 
 
 @router.get("/{apple_id}/drive-folders")
-async def get_drive_folders(apple_id: str):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
-    if account["status"] != "authenticated":
-        raise HTTPException(status_code=400, detail="Account nicht authentifiziert.")
-
-    folders = icloud_service.get_drive_folders(apple_id)
+async def get_drive_folders(apple_id: str) -> list[dict]:
+    require_account(apple_id, authenticated=True)
+
+    folders = await _icloud(icloud_service.get_drive_folders, apple_id)
     return folders
 
 
 @router.get("/{apple_id}/photo-libraries")
-async def get_photo_libraries(apple_id: str):
+async def get_photo_libraries(apple_id: str) -> list[dict]:
     """Return available photo libraries (primary + shared/family) for the account."""
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
-    if account["status"] != "authenticated":
-        raise HTTPException(status_code=400, detail="Account nicht authentifiziert.")
+    require_account(apple_id, authenticated=True)
 
-    libraries = icloud_service.get_photo_libraries(apple_id)
+    libraries = await _icloud(icloud_service.get_photo_libraries, apple_id)
 
     # For each shared library, check if another account already claims it
+    owners = config_store.get_shared_library_owners(exclude_apple_id=apple_id)
     for lib in libraries:
         if lib["type"] == "shared":
-            claimed_by = config_store.get_shared_library_owner(lib["id"], exclude_apple_id=apple_id)
-            lib["claimed_by"] = claimed_by  # None or the apple_id that already backs it up
+            lib["claimed_by"] = owners.get(lib["id"])  # None or the apple_id that already backs it up
 
     return libraries
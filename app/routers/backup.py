@@ -1,37 +1,134 @@
 """API routes for backup configuration and execution."""
 
 import asyncio
+import functools
 import logging
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException
 
 from app import config_store
+from app.config import settings
+from app.routers.deps import ACCOUNT_NOT_FOUND, json_response, require_account, require_account_with_config
 from app.schemas import (
     BackupConfigCreate, BackupConfigResponse, BackupTriggerResponse,
     ScheduleUpdate, ScheduleResponse,
 )
 from app.services import backup_service, icloud_service
 from app.services.notification import notify_backup_result, notify_token_expired
-from app.services.scheduler import check_token_expiry_for_account, sync_scheduled_jobs
+from app.services.scheduler import check_token_expiry_for_account, is_job_active, sync_scheduled_jobs
 
 log = logging.getLogger("icloud-backup")
 router = APIRouter(prefix="/api/backup", tags=["backup"])
 
+# Manually triggered backups run as background tasks.  The semaphore bounds
+# how many talk to iCloud at once (Apple throttles parallel sessions) and the
+# backups run on their own thread pool so they never compete with the
+# default executor.  _running_tasks keeps a reference to each account's task
+# until it completes (so it is queued or running while present), and
+# _queued_backups holds those still waiting for a free slot.
+_MAX_PARALLEL_BACKUPS = max(1, settings.backup_concurrency)
+_backup_slots = asyncio.Semaphore(_MAX_PARALLEL_BACKUPS)
+_backup_executor = ThreadPoolExecutor(max_workers=_MAX_PARALLEL_BACKUPS, thread_name_prefix="backup")
+_running_tasks: dict[str, asyncio.Task] = {}
+_queued_backups: set[str] = set()
+
+
+async def _in_backup_thread(func, **kwargs):
+    """Run a blocking backup_service call on the backup thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_backup_executor, functools.partial(func, **kwargs))
+
+
+def _backup_active(apple_id: str) -> bool:
+    """Return True while any backup for *apple_id* is queued, running or finishing.
+
+    Scheduled runs are not in _running_tasks; they show up through their
+    progress and, until their final status is written, through the scheduler.
+    """
+    return (
+        apple_id in _running_tasks
+        or backup_service.get_progress(apple_id) is not None
+        or is_job_active(apple_id)
+    )
+
+
+def _start_background(apple_id: str, run) -> None:
+    """Schedule *run* (a coroutine function) once a backup slot is free."""
+    async def _guarded():
+        try:
+            async with _backup_slots:
+                _queued_backups.discard(apple_id)
+                await run()
+        finally:
+            _queued_backups.discard(apple_id)
+
+    _queued_backups.add(apple_id)
+    task = asyncio.create_task(_guarded())
+    _running_tasks[apple_id] = task
+    task.add_done_callback(lambda _task, key=apple_id: _running_tasks.pop(key, None))
+
+
+async def _execute_backup(
+    apple_id: str, cfg: dict, folders: list[str], start_time: datetime, start_clock: float,
+) -> None:
+    """Run one backup, then persist its result and send notifications.
+
+    *start_time* is the persisted wall-clock start; *start_clock* is the
+    matching ``time.monotonic()`` reading used for the duration.
+    """
+    try:
+        result = await _in_backup_thread(
+            backup_service.run_backup,
+            args=backup_service.RunBackupArgs.from_config(apple_id, cfg, folders),
+        )
+        status = "success" if result["success"] else "error"
+        message = result["message"]
+        # Scan local backup dirs for file counts and sizes
+        dest = cfg.get("destination", "") or config_store.default_destination(apple_id)
+        storage = await _in_backup_thread(backup_service.get_backup_storage_stats, destination=dest)
+        stats = {
+            "drive": result.get("drive_stats"),
+            "photos": result.get("photos_stats"),
+            "contacts": result.get("contacts_stats"),
+            "calendar": result.get("calendar_stats"),
+            "storage": storage,
+        }
+        # Notify and update account status when token has expired
+        if result.get("auth_expired"):
+            config_store.update_account_status(
+                apple_id, status="requires_2fa",
+                status_message=message,
+            )
+            notify_token_expired(apple_id)
+    except Exception as exc:
+        log.error("Backup fehlgeschlagen für %s: %s", apple_id, exc)
+        status = "error"
+        message = str(exc)
+        stats = None
+
+    elapsed = time.monotonic() - start_clock
+    config_store.update_backup_status(
+        apple_id, status=status, message=message, stats=stats,
+        at=(start_time + timedelta(seconds=elapsed)).isoformat(),
+        duration_seconds=round(elapsed),
+    )
+    notify_backup_result(apple_id, status, message)
+
 
 @router.get("/configs/{apple_id}", response_model=BackupConfigResponse)
 async def get_backup_config(apple_id: str):
     cfg = config_store.get_backup_config(apple_id)
     if cfg is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+        raise HTTPException(status_code=404, detail=ACCOUNT_NOT_FOUND)
     return cfg
 
 
 @router.post("/configs/{apple_id}", response_model=BackupConfigResponse)
 async def create_or_update_backup_config(apple_id: str, data: BackupConfigCreate):
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
+    require_account(apple_id)
 
     cfg = config_store.save_backup_config(apple_id, data.model_dump())
     return cfg
@@ -40,88 +137,27 @@ async def create_or_update_backup_config(apple_id: str, data: BackupConfigCreate
 @router.post("/run/{apple_id}", response_model=BackupTriggerResponse)
 async def trigger_backup(apple_id: str):
     """Manually trigger a backup for the given account."""
-    account = config_store.get_account(apple_id)
-    if account is None:
-        raise HTTPException(status_code=404, detail="Account nicht gefunden.")
-    if account["status"] != "authenticated":
-        raise HTTPException(status_code=400, detail="Account nicht authentifiziert.")
+    _, cfg = require_account_with_config(apple_id, authenticated=True)
 
-    cfg = config_store.get_backup_config(apple_id)
-    if cfg is None or (not cfg.get("backup_drive") and not cfg.get("backup_photos") and not cfg.get("backup_contacts") and not cfg.get("backup_calendar")):
+    if not cfg.get("backup_drive") and not cfg.get("backup_photos") and not cfg.get("backup_contacts") and not cfg.get("backup_calendar"):
         raise HTTPException(status_code=400, detail="Keine Backup-Konfiguration vorhanden.")
 
-    # Mark as running
-    start_time = datetime.now(timezone.utc)
-    config_store.update_backup_status(
-        apple_id,
-        status="running",
-        started_at=start_time.isoformat(),
-    )
+    # Check token expiry before starting (may send a notification).  Awaited
+    # before the duplicate check so nothing yields between it and dispatch.
+    await asyncio.to_thread(check_token_expiry_for_account, apple_id)
 
-    # Parse folders
-    if cfg.get("drive_config_mode", "simple") == "simple":
-        folders = cfg.get("drive_folders_simple") or []
-    else:
-        text = cfg.get("drive_folders_advanced") or ""
-        folders = [line.strip() for line in text.splitlines() if line.strip()]
+    if _backup_active(apple_id):
+        raise HTTPException(status_code=400, detail="Backup läuft bereits.")
 
-    # Check token expiry before starting
-    check_token_expiry_for_account(apple_id)
+    # Mark as running
+    start_time, start_clock = datetime.now(timezone.utc), time.monotonic()
+    config_store.mark_running(apple_id, started_at=start_time.isoformat())
 
-    # Run backup in background thread
-    async def _run():
-        try:
-            result = await asyncio.to_thread(
-                backup_service.run_backup,
-                apple_id=apple_id,
-                backup_drive=cfg.get("backup_drive", False),
-                backup_photos=cfg.get("backup_photos", False),
-                backup_contacts=cfg.get("backup_contacts", False),
-                backup_calendar=cfg.get("backup_calendar", False),
-                drive_folders=folders,
-                photos_include_family=cfg.get("photos_include_family", False),
-                shared_library_id=cfg.get("shared_library_id"),
-                destination=cfg.get("destination", ""),
-                exclusions=cfg.get("exclusions"),
-                config_id=apple_id,
-                contacts_sync_policy=cfg.get("contacts_sync_policy", "archive"),
-                drive_sync_policy=cfg.get("drive_sync_policy", "delete"),
-                photos_sync_policy=cfg.get("photos_sync_policy", "keep"),
-            )
-            status = "success" if result["success"] else "error"
-            message = result["message"]
-            # Scan local backup dirs for file counts and sizes
-            dest = cfg.get("destination", "") or apple_id.replace("@", "_at_").replace(".", "_")
-            storage = backup_service.get_backup_storage_stats(dest)
-            stats = {
-                "drive": result.get("drive_stats"),
-                "photos": result.get("photos_stats"),
-                "contacts": result.get("contacts_stats"),
-                "calendar": result.get("calendar_stats"),
-                "storage": storage,
-            }
-            # Notify and update account status when token has expired
-            if result.get("auth_expired"):
-                config_store.update_account_status(
-                    apple_id, status="requires_2fa",
-                    status_message=message,
-                )
-                notify_token_expired(apple_id)
-        except Exception as exc:
-            log.error("Backup fehlgeschlagen für %s: %s", apple_id, exc)
-            status = "error"
-            message = str(exc)
-            stats = None
-
-        end_time = datetime.now(timezone.utc)
-        duration = round((end_time - start_time).total_seconds())
-        config_store.update_backup_status(
-            apple_id, status=status, message=message, stats=stats,
-            at=end_time.isoformat(), duration_seconds=duration,
-        )
-        notify_backup_result(apple_id, status, message)
+    folders = config_store.drive_folders(cfg)
 
-    asyncio.create_task(_run())
+    _start_background(
+        apple_id, functools.partial(_execute_backup, apple_id, cfg, folders, start_time, start_clock),
+    )
 
     return BackupTriggerResponse(
         message="Backup gestartet.",
@@ -132,85 +168,33 @@ async def trigger_backup(apple_id: str):
 @router.post("/run-all")
 async def trigger_all_backups():
     """Manually trigger backups for all configured and authenticated accounts."""
-    accounts = config_store.list_configured_accounts()
-    triggered = []
-    for acc in accounts:
-        apple_id = acc["apple_id"]
-        account = config_store.get_account(apple_id)
-        if account is None or account["status"] != "authenticated":
-            continue
-        cfg = config_store.get_backup_config(apple_id)
-        if cfg is None or (not cfg.get("backup_drive") and not cfg.get("backup_photos") and not cfg.get("backup_contacts") and not cfg.get("backup_calendar")):
-            continue
-
-        # Check if already running
-        if backup_service.get_progress(apple_id) is not None:
-            continue
-
-        check_token_expiry_for_account(apple_id)
-
-        run_start_time = datetime.now(timezone.utc)
-        config_store.update_backup_status(
-            apple_id, status="running", started_at=run_start_time.isoformat(),
-        )
+    # list_runnable_accounts() only returns authenticated, configured accounts
+    eligible = [
+        cfg for cfg in config_store.list_runnable_accounts()
+        # Skip accounts already queued or running
+        if not _backup_active(cfg["apple_id"])
+    ]
+
+    # Token checks may send notifications; run them in parallel off the loop
+    await asyncio.gather(*(
+        asyncio.to_thread(check_token_expiry_for_account, cfg["apple_id"]) for cfg in eligible
+    ))
+    # Another request or a scheduled run may have started some of them meanwhile
+    eligible = [cfg for cfg in eligible if not _backup_active(cfg["apple_id"])]
+
+    run_start_time, run_start_clock = datetime.now(timezone.utc), time.monotonic()
+    config_store.mark_backups_running(
+        [cfg["apple_id"] for cfg in eligible], started_at=run_start_time.isoformat(),
+    )
 
-        if cfg.get("drive_config_mode", "simple") == "simple":
-            folders = cfg.get("drive_folders_simple") or []
-        else:
-            text = cfg.get("drive_folders_advanced") or ""
-            folders = [line.strip() for line in text.splitlines() if line.strip()]
-
-        async def _run(apple_id=apple_id, cfg=cfg, folders=folders, _start=run_start_time):
-            try:
-                result = await asyncio.to_thread(
-                    backup_service.run_backup,
-                    apple_id=apple_id,
-                    backup_drive=cfg.get("backup_drive", False),
-                    backup_photos=cfg.get("backup_photos", False),
-                    backup_contacts=cfg.get("backup_contacts", False),
-                    backup_calendar=cfg.get("backup_calendar", False),
-                    drive_folders=folders,
-                    photos_include_family=cfg.get("photos_include_family", False),
-                    shared_library_id=cfg.get("shared_library_id"),
-                    destination=cfg.get("destination", ""),
-                    exclusions=cfg.get("exclusions"),
-                    config_id=apple_id,
-                    contacts_sync_policy=cfg.get("contacts_sync_policy", "archive"),
-                    drive_sync_policy=cfg.get("drive_sync_policy", "delete"),
-                    photos_sync_policy=cfg.get("photos_sync_policy", "keep"),
-                )
-                status = "success" if result["success"] else "error"
-                message = result["message"]
-                dest = cfg.get("destination", "") or apple_id.replace("@", "_at_").replace(".", "_")
-                storage = backup_service.get_backup_storage_stats(dest)
-                stats = {
-                    "drive": result.get("drive_stats"),
-                    "photos": result.get("photos_stats"),
-                    "contacts": result.get("contacts_stats"),
-                    "calendar": result.get("calendar_stats"),
-                    "storage": storage,
-                }
-                if result.get("auth_expired"):
-                    config_store.update_account_status(
-                        apple_id, status="requires_2fa",
-                        status_message=message,
-                    )
-                    notify_token_expired(apple_id)
-            except Exception as exc:
-                log.error("Backup fehlgeschlagen für %s: %s", apple_id, exc)
-                status = "error"
-                message = str(exc)
-                stats = None
-
-            end_time = datetime.now(timezone.utc)
-            duration = round((end_time - _start).total_seconds())
-            config_store.update_backup_status(
-                apple_id, status=status, message=message, stats=stats,
-                at=end_time.isoformat(), duration_seconds=duration,
-            )
-            notify_backup_result(apple_id, status, message)
+    triggered = []
+    for cfg in eligible:
+        apple_id = cfg["apple_id"]
+        folders = config_store.drive_folders(cfg)
 
-        asyncio.create_task(_run())
+        _start_background(
+            apple_id, functools.partial(_execute_backup, apple_id, cfg, folders, run_start_time, run_start_clock),
+        )
         triggered.append(apple_id)
 
     if not triggered:
@@ -222,6 +206,14 @@ async def trigger_all_backups():
 async def cancel_backup(apple_id: str):
     """Cancel a running backup for the given account."""
     cancelled = backup_service.request_cancel(apple_id)
+    if not cancelled and apple_id in _queued_backups:
+        # Still waiting for a slot – drop the task before it ever starts
+        _queued_backups.discard(apple_id)
+        _running_tasks[apple_id].cancel()
+        config_store.update_backup_status(
+            apple_id, status="error", message="Abgebrochen durch Benutzer",
+        )
+        cancelled = True
     if not cancelled:
         raise HTTPException(status_code=400, detail="Kein laufendes Backup gefunden.")
     return {"message": "Abbruch angefordert.", "apple_id": apple_id}
@@ -232,30 +224,30 @@ async def get_backup_status(apple_id: str):
     """Get current backup status for an account."""
     cfg = config_store.get_backup_config(apple_id)
     if cfg is None:
-        return {
+        return json_response({
             "status": "not_configured",
             "message": "Keine Backup-Konfiguration vorhanden.",
-        }
+        })
 
     status = cfg.get("last_backup_status", "idle")
 
     # Guard against phantom "running" state: if persisted status says running
-    # but no backup process is actually active, correct it.
-    if status == "running" and backup_service.get_progress(apple_id) is None:
+    # but no backup process is actually queued or active, correct it.
+    if status == "running" and not _backup_active(apple_id):
         status = "error"
         config_store.update_backup_status(
             apple_id, status="error",
             message="Backup durch Neustart unterbrochen.",
         )
 
-    return {
+    return json_response({
         "status": status,
         "message": cfg.get("last_backup_message"),
         "last_backup_at": cfg.get("last_backup_at"),
         "last_backup_started_at": cfg.get("last_backup_started_at"),
         "last_backup_duration_seconds": cfg.get("last_backup_duration_seconds"),
         "stats": cfg.get("last_backup_stats"),
-    }
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,44 @@
+"""Shared lookups, responses and error details for the API routers."""
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from app import config_store
+
+ACCOUNT_NOT_FOUND = "Account nicht gefunden."
+ACCOUNT_NOT_AUTHENTICATED = "Account nicht authentifiziert."
+
+
+def json_response(content) -> Response:
+    """Serialize a plain-dict payload with orjson instead of the stdlib encoder.
+
+    Endpoints with a response model are already serialized by pydantic-core;
+    this is for the polled routes that return untyped dicts.
+    """
+    return Response(orjson.dumps(content), media_type="application/json")
+
+
+def _check_account(account: dict | None, authenticated: bool) -> None:
+    if account is None:
+        raise HTTPException(status_code=404, detail=ACCOUNT_NOT_FOUND)
+    if authenticated and account["status"] != "authenticated":
+        raise HTTPException(status_code=400, detail=ACCOUNT_NOT_AUTHENTICATED)
+
+
+def require_account(apple_id: str, *, authenticated: bool = False) -> dict:
+    """Return the account for *apple_id* or raise the matching HTTP error.
+
+    With *authenticated* set, accounts that are not logged in to iCloud are
+    rejected with 400.
+    """
+    account = config_store.get_account(apple_id)
+    _check_account(account, authenticated)
+    return account
+
+
+def require_account_with_config(apple_id: str, *, authenticated: bool = False) -> tuple[dict, dict]:
+    """Like :func:`require_account`, but also return the backup config."""
+    account, cfg = config_store.get_account_with_config(apple_id)
+    _check_account(account, authenticated)
+    return account, cfg
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from app.models import AccountStatus, BackupStatus, DriveConfigMode, SyncPolicy
+from app.cron import cron_trigger
 
 
 class AccountCreate(BaseModel):
@@ -74,6 +75,14 @@ class ScheduleUpdate(BaseModel):
     enabled: bool = False
     cron: str = "0 2 * * *"
 
+    @field_validator("cron")
+    @classmethod
+    def _valid_cron(cls, value: str) -> str:
+        # Reject invalid expressions on save instead of when the job is registered
+        value = " ".join(value.split())
+        cron_trigger(value)
+        return value
+
 
 class ScheduleResponse(BaseModel):
     enabled: bool
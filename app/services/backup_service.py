@@ -1,19 +1,30 @@
 """Core backup logic for iCloud Drive, iCloud Photos, and iCloud Contacts."""
 
+import atexit
+import fnmatch
+import functools
 import gc
 import hashlib
+import itertools
 import json
 import logging
 import os
 import re
 import shutil
 import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
-from fnmatch import fnmatch
 from pathlib import Path
 from shutil import copyfileobj
+from typing import NamedTuple
+
+import orjson
 
 from app.config import settings
+from app.config_store import default_destination
 from app.models import SyncPolicy
 from app.services import icloud_service
 
@@ -24,34 +35,55 @@ log = logging.getLogger("icloud-backup")
 # Live progress tracking
 # ---------------------------------------------------------------------------
 
+# Progress entries are replaced wholesale and never mutated in place, and a
+# single dict get/set/pop is atomic, so readers need no lock: they see
+# either the previous or the new value.  The cancel flag is checked for
+# every file; only the rare check-then-set in request_cancel and the
+# teardown in _clear_progress take _cancel_lock so a flag is never set for
+# a run that has just ended.
 _progress: dict[str, dict] = {}  # keyed by apple_id
-_progress_lock = threading.Lock()
-_cancel_events: dict[str, threading.Event] = {}
+_cancel_lock = threading.Lock()
+_cancel_flags: dict[str, bool] = {}  # present while a backup runs
+
+_PROGRESS_INTERVAL = 0.5  # seconds between progress updates inside a loop
+_last_progress_update: dict[str, float] = {}
 
 
 def get_progress(config_id: str) -> dict | None:
-    with _progress_lock:
-        return _progress.get(config_id)
+    return _progress.get(config_id)
 
 
 def _set_progress(config_id: str, data: dict) -> None:
-    with _progress_lock:
-        _progress[config_id] = data
+    _progress[config_id] = data
+
+
+def _progress_due(config_id: str) -> bool:
+    """Return True at most every ``_PROGRESS_INTERVAL`` seconds per run.
+
+    Per-file loops gate their progress updates on this so the snapshot dict
+    is built a few times per second rather than once per file; callers
+    publish a final update after the loop.
+    """
+    now = time.monotonic()
+    if now - _last_progress_update.get(config_id, 0.0) < _PROGRESS_INTERVAL:
+        return False
+    _last_progress_update[config_id] = now
+    return True
 
 
 def _clear_progress(config_id: str) -> None:
-    with _progress_lock:
-        _progress.pop(config_id, None)
-        _cancel_events.pop(config_id, None)
+    _progress.pop(config_id, None)
+    _last_progress_update.pop(config_id, None)
+    with _cancel_lock:
+        _cancel_flags.pop(config_id, None)
 
 
 def request_cancel(config_id: str) -> bool:
     """Request cancellation of a running backup. Returns True if a backup was running."""
-    with _progress_lock:
-        ev = _cancel_events.get(config_id)
-        if ev is None:
+    with _cancel_lock:
+        if config_id not in _cancel_flags:
             return False
-        ev.set()
+        _cancel_flags[config_id] = True
         return True
 
 
@@ -59,15 +91,12 @@ def _is_cancelled(config_id: str | None) -> bool:
     """Check whether cancellation has been requested."""
     if config_id is None:
         return False
-    with _progress_lock:
-        ev = _cancel_events.get(config_id)
-        return ev is not None and ev.is_set()
+    return _cancel_flags.get(config_id, False)
 
 
 def _register_cancel_event(config_id: str) -> None:
-    """Register a fresh cancel event for the given backup run."""
-    with _progress_lock:
-        _cancel_events[config_id] = threading.Event()
+    """Arm a fresh cancel flag for the given backup run."""
+    _cancel_flags[config_id] = False
 
 
 class BackupCancelled(Exception):
@@ -90,22 +119,90 @@ def _cache_path(destination: str, folder_name: str) -> Path:
     return settings.config_path / f".icloud-backup-state-{destination}-{safe}.json"
 
 
+# Cache files are written on short-lived background threads so the next
+# folder can start while the previous cache is still being flushed.  Every
+# path has at most one writer; loading a cache waits for its writer first.
+_cache_write_lock = threading.Lock()
+_cache_writers: dict[Path, threading.Thread] = {}
+# Writers started by the backup run on the current thread, so each run only
+# waits for its own caches and not for those of other accounts.
+_run_writes = threading.local()
+
+
+def _write_atomic(path: Path, data: bytes, failure_msg: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        log.warning("%s: %s", failure_msg, exc)
+
+
+def _wait_for_cache_write(path: Path) -> None:
+    with _cache_write_lock:
+        writer = _cache_writers.pop(path, None)
+    if writer is not None:
+        writer.join()
+
+
+def _write_cache_async(path: Path, cache: dict, failure_msg: str) -> threading.Thread | None:
+    """Serialise *cache* now and write it to *path* on a background thread."""
+    # Serialised on the calling thread so later changes to *cache* are not
+    # picked up half-way through the write.
+    try:
+        data = orjson.dumps(cache)
+    except Exception as exc:
+        log.warning("%s: %s", failure_msg, exc)
+        return None
+    _wait_for_cache_write(path)
+    writer = threading.Thread(
+        target=_write_atomic, args=(path, data, failure_msg), name="cache-write", daemon=True,
+    )
+    with _cache_write_lock:
+        _cache_writers[path] = writer
+    writer.start()
+    started = getattr(_run_writes, "writers", None)
+    if started is not None:
+        started.append((path, writer))
+    return writer
+
+
+def _join_cache_writes(writers: list[tuple[Path, threading.Thread]]) -> None:
+    for path, writer in writers:
+        writer.join()
+        with _cache_write_lock:
+            if _cache_writers.get(path) is writer:
+                del _cache_writers[path]
+
+
+def flush_cache_writes() -> None:
+    """Wait until all pending cache writes have reached the disk."""
+    with _cache_write_lock:
+        writers = list(_cache_writers.items())
+    _join_cache_writes(writers)
+
+
+atexit.register(flush_cache_writes)
+
+
 def _load_cache(destination: str, folder_name: str) -> dict:
     path = _cache_path(destination, folder_name)
-    if path.exists():
-        try:
-            return json.loads(path.read_text())
-        except Exception:
-            log.warning("Cache-Datei beschädigt, wird ignoriert: %s", path)
+    _wait_for_cache_write(path)
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception:
+        log.warning("Cache-Datei beschädigt, wird ignoriert: %s", path)
     return {}
 
 
-def _save_cache(destination: str, folder_name: str, cache: dict) -> None:
-    path = _cache_path(destination, folder_name)
-    try:
-        path.write_text(json.dumps(cache, indent=2))
-    except Exception as exc:
-        log.warning("Cache konnte nicht gespeichert werden: %s", exc)
+def _save_cache(destination: str, folder_name: str, cache: dict) -> threading.Thread | None:
+    # Written compactly: the file is internal state and can hold tens of
+    # thousands of entries for large folders.
+    return _write_cache_async(
+        _cache_path(destination, folder_name), cache, "Cache konnte nicht gespeichert werden",
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -120,20 +217,20 @@ def _photo_cache_path(destination: str, library_name: str) -> Path:
 
 def _load_photo_cache(destination: str, library_name: str) -> dict:
     path = _photo_cache_path(destination, library_name)
-    if path.exists():
-        try:
-            return json.loads(path.read_text())
-        except Exception:
-            log.warning("Photo-Cache beschädigt, wird ignoriert: %s", path)
+    _wait_for_cache_write(path)
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception:
+        log.warning("Photo-Cache beschädigt, wird ignoriert: %s", path)
     return {}
 
 
-def _save_photo_cache(destination: str, library_name: str, cache: dict) -> None:
-    path = _photo_cache_path(destination, library_name)
-    try:
-        path.write_text(json.dumps(cache, indent=2))
-    except Exception as exc:
-        log.warning("Photo-Cache konnte nicht gespeichert werden: %s", exc)
+def _save_photo_cache(destination: str, library_name: str, cache: dict) -> threading.Thread | None:
+    return _write_cache_async(
+        _photo_cache_path(destination, library_name), cache, "Photo-Cache konnte nicht gespeichert werden",
+    )
 
 
 def _photo_fingerprint(photo) -> str | None:
@@ -168,7 +265,50 @@ def _is_glob(pattern: str) -> bool:
     return any(c in pattern for c in ("*", "?", "["))
 
 
-def is_excluded(rel_path: str, excludes: list[str]) -> bool:
+class CompiledExcludes(NamedTuple):
+    """Exclusion patterns pre-sorted by kind (see :func:`is_excluded`)."""
+
+    component_re: re.Pattern | None  # globs without slash, matched per path component
+    path_re: re.Pattern | None       # globs with slash, matched against the full path
+    prefixes: tuple[str, ...]        # plain path patterns, matched as prefixes
+    names: frozenset[str]            # plain names, matched per path component
+
+
+def _glob_union(patterns: list[str]) -> re.Pattern | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_excludes_cached(excludes: tuple[str, ...]) -> CompiledExcludes:
+    component_globs, path_globs, prefixes, names = [], [], [], []
+    for pattern in excludes:
+        if _is_glob(pattern):
+            (path_globs if "/" in pattern else component_globs).append(pattern)
+        elif "/" in pattern:
+            prefixes.append(pattern)
+        else:
+            names.append(pattern)
+    return CompiledExcludes(
+        _glob_union(component_globs), _glob_union(path_globs), tuple(prefixes), frozenset(names),
+    )
+
+
+def compile_excludes(excludes: list[str] | CompiledExcludes | None) -> CompiledExcludes | None:
+    """Compile *excludes* once so each :func:`is_excluded` call is a few C-level matches.
+
+    Returns ``None`` when there is nothing to exclude; already compiled
+    patterns are passed through.
+    """
+    if not excludes:
+        return None
+    if isinstance(excludes, CompiledExcludes):
+        return excludes
+    return _compile_excludes_cached(tuple(excludes))
+
+
+def is_excluded(rel_path: str, excludes: list[str] | CompiledExcludes | None) -> bool:
     """Check whether *rel_path* matches any exclusion pattern.
 
     Supported patterns:
@@ -179,30 +319,45 @@ def is_excluded(rel_path: str, excludes: list[str]) -> bool:
       - Simple names (no slash): matches any path component
       - Path patterns (with slash, no globs): ``Ablage/gescannte Alben``
         matches if *rel_path* starts with or equals the pattern
+
+    Pass the result of :func:`compile_excludes` on hot paths; a plain list
+    is compiled (and cached) on the fly.
     """
-    if not excludes:
+    compiled = compile_excludes(excludes)
+    if compiled is None:
         return False
 
-    parts = rel_path.split("/")
-    for pattern in excludes:
-        if _is_glob(pattern):
-            if "/" in pattern:
-                # Path-based glob: match against the full relative path
-                if fnmatch(rel_path, pattern):
-                    return True
-            else:
-                # Component-level glob: match against individual parts
-                if any(fnmatch(p, pattern) for p in parts):
-                    return True
-        elif "/" in pattern:
-            if rel_path.startswith(pattern) or rel_path == pattern:
-                return True
-        else:
-            if pattern in parts:
-                return True
+    if compiled.prefixes and rel_path.startswith(compiled.prefixes):
+        return True
+    if compiled.path_re is not None and compiled.path_re.match(rel_path):
+        return True
+    if compiled.names or compiled.component_re is not None:
+        parts = rel_path.split("/")
+        if not compiled.names.isdisjoint(parts):
+            return True
+        if compiled.component_re is not None:
+            match = compiled.component_re.match
+            return any(match(p) for p in parts)
     return False
 
 
+def _is_child_excluded(rel_path: str, name: str, excludes: CompiledExcludes | None) -> bool:
+    """:func:`is_excluded` for an entry *name* whose parent path already passed.
+
+    Component patterns only need to look at the new last component, so
+    tree walks skip splitting every path.
+    """
+    if excludes is None:
+        return False
+    if excludes.prefixes and rel_path.startswith(excludes.prefixes):
+        return True
+    if excludes.path_re is not None and excludes.path_re.match(rel_path):
+        return True
+    if name in excludes.names:
+        return True
+    return excludes.component_re is not None and excludes.component_re.match(name) is not None
+
+
 def _adjust_excludes_for_folder(folder_name: str, excludes: list[str] | None) -> list[str]:
     """Strip *folder_name* prefix from path-based exclusion patterns.
 
@@ -233,6 +388,17 @@ def _adjust_excludes_for_folder(folder_name: str, excludes: list[str] | None) ->
 # iCloud Drive backup
 # ---------------------------------------------------------------------------
 
+# Downloads are bound by network latency, so a few run side by side.  Kept
+# small because Apple throttles sessions that open many parallel transfers.
+_DOWNLOAD_WORKERS = max(1, settings.download_concurrency)
+
+# Folder listings fetched ahead while walking a Drive tree.
+_LISTING_WORKERS = 4
+
+# Read/write granularity for streamed downloads.  Large chunks keep the
+# per-chunk Python overhead negligible for multi-gigabyte files.
+_COPY_CHUNK_SIZE = 1024 * 1024
+
 # Characters that have special meaning in URLs and may cause issues with
 # the iCloud document service when they appear in folder/file names.
 _URL_SPECIAL_CHARS = set("#%?&+")
@@ -540,73 +706,106 @@ def _open_drive_node(node, rel_path: str, **kwargs):
 
         raise first_exc
 
-def _walk_remote(node, prefix: str = "", excludes: list[str] | None = None,
-                 cache: dict | None = None):
-    """Recursively yield ``(relative_path, node)`` for all files under *node*.
+def _list_children(node) -> list:
+    """Return the child nodes of a Drive folder (empty if the listing fails)."""
+    try:
+        return node.get_children()
+    except Exception:
+        return []
+
+
+def _node_etag(node) -> str | None:
+    """Return the etag of a Drive node (pyicloud keeps it in ``node.data``)."""
+    return node.data.get("etag")
+
+
+def _walk_remote(node, prefix: str = "", excludes: CompiledExcludes | None = None,
+                 cache: dict | None = None, skipped: set[str] | None = None):
+    """Yield ``(relative_path, node, etag)`` for all files under *node*.
 
     When *cache* is provided, folders whose etag matches the cached value
     are skipped entirely.  Yields an additional sentinel
     ``(folder_rel_path, None, new_etag)`` for folders so the caller can
-    update the cache after an error-free run.
+    update the cache after an error-free run.  The relative paths of
+    folders skipped this way are added to *skipped* when given.
+
+    The tree is walked breadth-first: listing a folder is an API round
+    trip, so the listings of all sub-folders found so far are fetched
+    ahead on a small pool while the caller works through earlier entries.
     """
-    excludes = excludes or []
+    pool = ThreadPoolExecutor(max_workers=_LISTING_WORKERS, thread_name_prefix="drive-ls")
     try:
-        children = node.dir()
-    except Exception:
-        children = []
-
-    for name in children:
-        child = node[name]
-        rel = f"{prefix}/{name}" if prefix else name
-
-        if is_excluded(rel, excludes):
-            log.debug("Excluded: %s", rel)
-            continue
-
-        if child.type == "folder":
-            # Etag-based skip
-            child_etag = getattr(child, "etag", None)
-            if cache is not None and child_etag:
-                cached_etag = cache.get(rel)
-                if cached_etag and cached_etag == child_etag:
-                    log.debug("Cache-Hit (etag unverändert): %s", rel)
+        queue = deque([(prefix, None, pool.submit(_list_children, node))])
+        while queue:
+            folder_rel, folder_etag, listing = queue.popleft()
+            for child in listing.result():
+                name = child.name
+                rel = f"{folder_rel}/{name}" if folder_rel else name
+
+                # Parent folders were checked before being descended into
+                if _is_child_excluded(rel, name, excludes):
+                    log.debug("Excluded: %s", rel)
                     continue
 
-            yield from _walk_remote(child, rel, excludes, cache)
+                if child.type == "folder":
+                    # Etag-based skip
+                    child_etag = _node_etag(child)
+                    if cache is not None and child_etag:
+                        cached_etag = cache.get(rel)
+                        if cached_etag and cached_etag == child_etag:
+                            log.debug("Cache-Hit (etag unverändert): %s", rel)
+                            if skipped is not None:
+                                skipped.add(rel)
+                            continue
+                    queue.append((rel, child_etag, pool.submit(_list_children, child)))
+                else:
+                    yield rel, child, _node_etag(child)
 
             # Yield folder etag so caller can update cache
-            if child_etag:
-                yield rel, None, child_etag
-        else:
-            yield rel, child, None
+            if folder_etag:
+                yield folder_rel, None, folder_etag
+    finally:
+        pool.shutdown(cancel_futures=True)
+
 
+def _file_needs_update(node, local_path: Path, package_size: int | None = None) -> bool:
+    """Return True when the local file is missing or outdated.
 
-def _file_needs_update(node, local_path: Path) -> bool:
-    """Return True when the local file is missing or outdated."""
-    if not local_path.exists():
+    *package_size* is the on-disk size recorded for a package download;
+    a local file of that size counts as matching just like ``node.size``.
+    """
+    try:
+        local_stat = os.stat(local_path)
+    except FileNotFoundError:
         log.debug(
             "Update nötig (lokal nicht vorhanden): %s",
             local_path.name,
         )
         return True
+    except OSError as exc:
+        log.debug(
+            "Update nötig (Prüfung fehlgeschlagen): %s – %s",
+            local_path.name, exc,
+        )
+        return True
     try:
         remote_size = node.size or 0
-        local_size = local_path.stat().st_size
-        if remote_size != local_size:
+        if local_stat.st_size not in (remote_size, package_size):
             log.debug(
                 "Update nötig (Größe unterschiedlich): %s – "
                 "remote=%s Bytes, lokal=%s Bytes",
-                local_path.name, remote_size, local_size,
+                local_path.name, remote_size, local_stat.st_size,
             )
             return True
-        remote_mtime = node.date_modified.timestamp() if node.date_modified else 0
-        local_mtime = local_path.stat().st_mtime
-        if abs(remote_mtime - local_mtime) > 2:
+        # date_modified parses the date string on every access
+        date_modified = node.date_modified
+        remote_mtime = date_modified.timestamp() if date_modified else 0
+        if abs(remote_mtime - local_stat.st_mtime) > 2:
             log.debug(
                 "Update nötig (mtime unterschiedlich): %s – "
                 "remote=%s, lokal=%s, diff=%.1fs",
-                local_path.name, remote_mtime, local_mtime,
-                abs(remote_mtime - local_mtime),
+                local_path.name, remote_mtime, local_stat.st_mtime,
+                abs(remote_mtime - local_stat.st_mtime),
             )
             return True
     except Exception as exc:
@@ -654,6 +853,99 @@ def _apply_sync_policy(
         stats["errors"] += 1
 
 
+def _download_drive_file(node, rel_path: str, local_path: Path, config_id: str | None) -> int | None:
+    """Download one Drive file to *local_path* (runs on the download pool).
+
+    Returns the size of the written file, or ``None`` when the download
+    failed.  Raises :class:`BackupCancelled` if the backup was cancelled
+    before the download started.
+    """
+    _check_cancel(config_id)
+    tmp_path = local_path.with_suffix(local_path.suffix + ".tmp")
+
+    try:
+        with open(tmp_path, "wb") as fh:
+            response = _open_drive_node(node, rel_path, stream=True)
+            copyfileobj(response.raw, fh, _COPY_CHUNK_SIZE)
+        os.replace(tmp_path, local_path)
+
+        date_modified = node.date_modified
+        if date_modified:
+            mtime = date_modified.timestamp()
+            os.utime(local_path, (mtime, mtime))
+
+        # Log post-download comparison to detect persistent mismatches
+        _local_stat = local_path.stat()
+        if date_modified:
+            _remote_ts = mtime
+            if abs(_remote_ts - _local_stat.st_mtime) > 2:
+                log.warning(
+                    "mtime-Abweichung nach Download: %s – "
+                    "remote=%s, lokal=%s, diff=%.1fs "
+                    "(Datei wird beim nächsten Lauf erneut heruntergeladen!)",
+                    rel_path, _remote_ts, _local_stat.st_mtime,
+                    abs(_remote_ts - _local_stat.st_mtime),
+                )
+
+        log.info("Heruntergeladen: %s", rel_path)
+        return _local_stat.st_size
+    except Exception as exc:
+        log.error("Fehler beim Herunterladen von %s: %s", rel_path, exc)
+        _drivewsid = node.data.get("drivewsid", "")
+        if _drivewsid.startswith("FILE_IN_SHARED_FOLDER"):
+            log.warning(
+                "Hinweis: '%s' ist eine Datei in einem geteilten Ordner "
+                "(Shared Folder). Apple's Download-API unterstützt "
+                "geteilte Ordner nur eingeschränkt. "
+                "Mögliche Lösung: Den Ordnerinhalt in einen eigenen, "
+                "nicht geteilten Ordner kopieren.",
+                rel_path,
+            )
+        elif _has_url_special_chars(rel_path):
+            log.warning(
+                "Hinweis: Der Pfad '%s' enthält Sonderzeichen "
+                "(z.B. #, %%, ?, &, + oder Nicht-ASCII wie ®). "
+                "Dies kann Probleme mit der iCloud-API verursachen. "
+                "Bitte den Ordner/die Datei in iCloud Drive "
+                "umbenennen.",
+                rel_path,
+            )
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return None
+
+
+def _reconcile_tree(
+    root: Path,
+    remote_files: set[str],
+    sync_policy: str,
+    archive_dest: Path,
+    stats: dict,
+) -> None:
+    """Apply *sync_policy* to local files below *root* missing from *remote_files*.
+
+    A single bottom-up ``os.walk`` handles the orphans of each directory
+    and then removes it if that left it empty, so no second pass or sort
+    is needed.  *root* itself is kept.
+    """
+    root_str = str(root)
+    for dirpath, _dirnames, filenames in os.walk(root_str, topdown=False):
+        rel_dir = dirpath[len(root_str) + 1:].replace(os.sep, "/")
+        for fname in filenames:
+            if fname.endswith(".tmp"):
+                continue
+            rel = f"{rel_dir}/{fname}" if rel_dir else fname
+            if rel not in remote_files:
+                _apply_sync_policy(Path(dirpath, fname), rel, sync_policy, archive_dest, stats)
+
+        # Clean up empty directories
+        if rel_dir:
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
 def sync_drive_folder(
     apple_id: str,
     folder_name: str,
@@ -701,158 +993,157 @@ def sync_drive_folder(
 
     # Adjust exclusion patterns: strip folder_name prefix from path patterns
     # so "Ablage/gescannte Alben" becomes "gescannte Alben" inside the Ablage walk
-    adjusted_excludes = _adjust_excludes_for_folder(folder_name, excludes)
+    adjusted_excludes = compile_excludes(_adjust_excludes_for_folder(folder_name, excludes))
 
     # Load etag cache
     cache = _load_cache(destination_key, folder_name)
     new_etags: dict[str, str] = {}
-    pkg_sizes: dict[str, int] = cache.get("_package_sizes", {})
+    pkg_sizes: dict[str, int] = dict(cache.get("_package_sizes", {}))
 
     remote_files: set[str] = set()
+    skipped_folders: set[str] = set()
+
+    # The remote tree is walked on this thread while downloads overlap on a
+    # small pool.  Results are folded into stats here, so the counters and
+    # caches are only ever touched by this thread.
+    pending: dict[Future, tuple[str, int, str | None]] = {}
+    made_dirs: set[Path] = set()
+
+    last_file = ""
+
+    def _collect(done) -> None:
+        nonlocal last_file
+        for future in done:
+            rel_path, node_size, etag = pending.pop(future)
+            last_file = rel_path
+            local_size = future.result()
+            if local_size is None:
+                stats["errors"] += 1
+            else:
+                if node_size and local_size != node_size:
+                    log.info(
+                        "Package-Download: %s – remote=%s Bytes, "
+                        "heruntergeladen=%s Bytes (Größe wird gecacht)",
+                        rel_path, node_size, local_size,
+                    )
+                    pkg_sizes[rel_path] = local_size
+                if etag:
+                    new_etags[rel_path] = etag
+                stats["downloaded"] += 1
 
-    for rel_path, node, etag in _walk_remote(folder_node, excludes=adjusted_excludes, cache=cache):
-        _check_cancel(config_id)
-
-        # Folder etag sentinel
-        if node is None and etag:
-            new_etags[rel_path] = etag
-            continue
+            # Update progress
+            if config_id is not None and _progress_due(config_id):
+                _set_progress(config_id, {
+                    "phase": "drive",
+                    "folder": folder_name,
+                    "current_file": rel_path,
+                    **stats,
+                })
 
-        remote_files.add(rel_path)
-        local_path = dest / rel_path
+    with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS, thread_name_prefix="drive-dl") as pool:
+        try:
+            for rel_path, node, etag in _walk_remote(
+                folder_node, excludes=adjusted_excludes, cache=cache, skipped=skipped_folders,
+            ):
+                _check_cancel(config_id)
+
+                # Folder etag sentinel
+                if node is None and etag:
+                    new_etags[rel_path] = etag
+                    continue
 
-        # Package size cache: iCloud delivers bundles (e.g. .sparsebundle)
-        # as compressed archives via package_token.  The metadata size
-        # (node.size) differs from the actual download size, so a normal
-        # size comparison would trigger an unnecessary re-download every
-        # run.  When a previous download recorded the real on-disk size we
-        # accept it if the mtime also still matches.
-        if local_path.exists() and rel_path in pkg_sizes:
-            try:
-                _st = local_path.stat()
-                if _st.st_size == pkg_sizes[rel_path]:
-                    remote_mtime = node.date_modified.timestamp() if node.date_modified else 0
-                    if abs(remote_mtime - _st.st_mtime) <= 2:
-                        log.debug("Package-Cache-Hit: %s (bekannte Größe %s)", rel_path, pkg_sizes[rel_path])
+                remote_files.add(rel_path)
+                local_path = dest / rel_path
+
+                # File etag unchanged since it was last verified: a size
+                # check is enough to confirm the local copy is still there
+                if etag and cache.get(rel_path) == etag:
+                    try:
+                        local_size = os.stat(local_path).st_size
+                    except OSError:
+                        local_size = None
+                    if local_size is not None and local_size in (node.size or 0, pkg_sizes.get(rel_path)):
+                        new_etags[rel_path] = etag
                         stats["skipped"] += 1
                         continue
-            except OSError:
-                pass
-
-        if not _file_needs_update(node, local_path):
-            stats["skipped"] += 1
-            continue
 
-        # Log remote node metadata to help diagnose repeated downloads
-        _node_type = getattr(node, "type", "unknown")
-        _node_size = node.size if node.size else 0
-        _node_mtime = node.date_modified if node.date_modified else None
-        _node_drivewsid = node.data.get("drivewsid", "") if hasattr(node, "data") else ""
-        log.debug(
-            "Download wird gestartet: %s – type=%s, remote_size=%s, "
-            "remote_mtime=%s, drivewsid=%s",
-            rel_path, _node_type, _node_size, _node_mtime, _node_drivewsid,
-        )
-
-        if dry_run:
-            log.info("[DRY RUN] Würde herunterladen: %s", rel_path)
-            stats["downloaded"] += 1
-            continue
-
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = local_path.with_suffix(local_path.suffix + ".tmp")
+                # Package size cache: iCloud delivers bundles (e.g. .sparsebundle)
+                # as compressed archives via package_token.  The metadata size
+                # (node.size) differs from the actual download size, so a normal
+                # size comparison would trigger an unnecessary re-download every
+                # run.  When a previous download recorded the real on-disk size we
+                # accept it if the mtime also still matches; the same stat
+                # call covers both checks.
+                if not _file_needs_update(node, local_path, pkg_sizes.get(rel_path)):
+                    if etag:
+                        new_etags[rel_path] = etag
+                    stats["skipped"] += 1
+                    continue
 
-        try:
-            with open(tmp_path, "wb") as fh:
-                response = _open_drive_node(node, rel_path, stream=True)
-                copyfileobj(response.raw, fh)
-            tmp_path.rename(local_path)
-
-            if node.date_modified:
-                mtime = node.date_modified.timestamp()
-                os.utime(local_path, (mtime, mtime))
-
-            # Log post-download comparison to detect persistent mismatches
-            _local_stat = local_path.stat()
-            _local_size = _local_stat.st_size
-            _local_mtime = _local_stat.st_mtime
-            if _node_size and _local_size != _node_size:
-                log.info(
-                    "Package-Download: %s – remote=%s Bytes, "
-                    "heruntergeladen=%s Bytes (Größe wird gecacht)",
-                    rel_path, _node_size, _local_size,
-                )
-                pkg_sizes[rel_path] = _local_size
-            if _node_mtime:
-                _remote_ts = _node_mtime.timestamp()
-                if abs(_remote_ts - _local_mtime) > 2:
-                    log.warning(
-                        "mtime-Abweichung nach Download: %s – "
-                        "remote=%s, lokal=%s, diff=%.1fs "
-                        "(Datei wird beim nächsten Lauf erneut heruntergeladen!)",
-                        rel_path, _remote_ts, _local_mtime,
-                        abs(_remote_ts - _local_mtime),
+                # Log remote node metadata to help diagnose repeated downloads
+                _node_size = node.size or 0
+                if log.isEnabledFor(logging.DEBUG):
+                    _node_type = getattr(node, "type", "unknown")
+                    _node_drivewsid = node.data.get("drivewsid", "") if hasattr(node, "data") else ""
+                    log.debug(
+                        "Download wird gestartet: %s – type=%s, remote_size=%s, "
+                        "remote_mtime=%s, drivewsid=%s",
+                        rel_path, _node_type, _node_size, node.date_modified, _node_drivewsid,
                     )
 
-            log.info("Heruntergeladen: %s", rel_path)
-            stats["downloaded"] += 1
-        except Exception as exc:
-            log.error("Fehler beim Herunterladen von %s: %s", rel_path, exc)
-            _drivewsid = node.data.get("drivewsid", "")
-            if _drivewsid.startswith("FILE_IN_SHARED_FOLDER"):
-                log.warning(
-                    "Hinweis: '%s' ist eine Datei in einem geteilten Ordner "
-                    "(Shared Folder). Apple's Download-API unterstützt "
-                    "geteilte Ordner nur eingeschränkt. "
-                    "Mögliche Lösung: Den Ordnerinhalt in einen eigenen, "
-                    "nicht geteilten Ordner kopieren.",
-                    rel_path,
-                )
-            elif _has_url_special_chars(rel_path):
-                log.warning(
-                    "Hinweis: Der Pfad '%s' enthält Sonderzeichen "
-                    "(z.B. #, %%, ?, &, + oder Nicht-ASCII wie ®). "
-                    "Dies kann Probleme mit der iCloud-API verursachen. "
-                    "Bitte den Ordner/die Datei in iCloud Drive "
-                    "umbenennen.",
-                    rel_path,
-                )
-            if tmp_path.exists():
-                tmp_path.unlink()
-            stats["errors"] += 1
+                if dry_run:
+                    log.info("[DRY RUN] Würde herunterladen: %s", rel_path)
+                    stats["downloaded"] += 1
+                    continue
 
-        # Update progress
-        if config_id is not None:
-            _set_progress(config_id, {
-                "phase": "drive",
-                "folder": folder_name,
-                "current_file": rel_path,
-                **stats,
-            })
+                # Created here, once per folder, rather than by every download
+                parent = local_path.parent
+                if parent not in made_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    made_dirs.add(parent)
+
+                if len(pending) >= 2 * _DOWNLOAD_WORKERS:
+                    _collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                future = pool.submit(_download_drive_file, node, rel_path, local_path, config_id)
+                pending[future] = (rel_path, _node_size, etag)
+            while pending:
+                _collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        except BackupCancelled:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    if config_id is not None:
+        _set_progress(config_id, {
+            "phase": "drive",
+            "folder": folder_name,
+            "current_file": last_file,
+            **stats,
+        })
 
     # Handle local files that no longer exist remotely
     if not dry_run and sync_policy != SyncPolicy.KEEP:
         archive_dest = settings.archive_path / destination_key / "drive" / folder_name
-        for local_file in dest.rglob("*"):
-            if local_file.is_file() and not local_file.name.endswith(".tmp"):
-                rel = str(local_file.relative_to(dest))
-                if rel not in remote_files:
-                    _apply_sync_policy(local_file, rel, sync_policy, archive_dest, stats)
-
-        # Clean up empty directories
-        for dirpath in sorted(dest.rglob("*"), reverse=True):
-            if dirpath.is_dir() and not any(dirpath.iterdir()):
-                dirpath.rmdir()
+        _reconcile_tree(dest, remote_files, sync_policy, archive_dest, stats)
 
-    # Save etag cache only when no errors occurred
+    # Save etag cache only when no errors occurred, and only if it changed:
+    # on an unchanged folder the whole file would be rewritten for nothing
     if stats["errors"] == 0:
-        cache.update(new_etags)
-        # Prune package sizes for files that no longer exist remotely
-        if pkg_sizes:
-            cache["_package_sizes"] = {
-                k: v for k, v in pkg_sizes.items() if k in remote_files
-            }
-        _save_cache(destination_key, folder_name, cache)
+        def _still_remote(rel: str) -> bool:
+            # Walked this run, or inside a folder skipped by its etag
+            if rel in new_etags or rel in remote_files:
+                return True
+            parts = rel.split("/")
+            return any("/".join(parts[:i]) in skipped_folders for i in range(1, len(parts) + 1))
+
+        new_cache = {
+            k: v for k, v in cache.items() if k != "_package_sizes" and _still_remote(k)
+        }
+        new_cache.update(new_etags)
+        kept_sizes = {k: v for k, v in pkg_sizes.items() if _still_remote(k)}
+        if kept_sizes:
+            new_cache["_package_sizes"] = kept_sizes
+        if new_cache != cache:
+            _save_cache(destination_key, folder_name, new_cache)
 
     return stats
 
@@ -943,27 +1234,49 @@ def _photo_date(photo) -> datetime | None:
     return None
 
 
-def _unique_path(path: Path) -> Path:
-    """Return *path* if it does not exist, else append a counter to avoid collisions."""
-    if not path.exists():
+@functools.lru_cache(maxsize=4096)
+def _date_dir(dest_path: Path, year: int, month: int, day: int) -> Path:
+    """Return the ``YYYY/MM/DD`` folder below *dest_path*.
+
+    Photos cluster by day, so the cache turns most lookups into a hit
+    instead of three path joins.
+    """
+    return dest_path / f"{year:04d}" / f"{month:02d}" / f"{day:02d}"
+
+
+def _unique_path(path: Path, taken: set[Path] | frozenset[Path] = frozenset()) -> Path:
+    """Return *path* if it is free, else append a counter to avoid collisions.
+
+    Paths in *taken* are treated as existing.  The directory is listed once
+    rather than probing each counter value with its own stat call.
+    """
+    if path not in taken and not path.exists():
         return path
+    parent = path.parent
+    try:
+        with os.scandir(parent) as entries:
+            existing = {entry.name for entry in entries}
+    except OSError:
+        existing = set()
+    existing.update(p.name for p in taken if p.parent == parent)
     stem = path.stem
     suffix = path.suffix
-    parent = path.parent
-    counter = 1
-    while True:
-        candidate = parent / f"{stem}_{counter}{suffix}"
-        if not candidate.exists():
-            return candidate
-        counter += 1
+    for counter in itertools.count(1):
+        name = f"{stem}_{counter}{suffix}"
+        if name not in existing:
+            return parent / name
 
 
-def _download_photo(photo, local_path: Path, stats: dict) -> None:
+def _download_photo(photo, local_path: Path, config_id: str | None = None) -> bool:
     """Download a single photo asset to *local_path* with true streaming.
 
     Bypasses photo.download() which reads the entire file into RAM.
     Instead, we get the download URL and stream directly to disk in chunks.
+    Returns True on success; runs on the download pool.  Raises
+    :class:`BackupCancelled` if the backup was cancelled before the
+    download started.
     """
+    _check_cancel(config_id)
     fname = getattr(photo, "filename", "?")
 
     # Get download URL from photo versions (avoids photo.download() which
@@ -973,13 +1286,11 @@ def _download_photo(photo, local_path: Path, stats: dict) -> None:
         version_info = versions.get("original")
         if not version_info or not version_info.get("url"):
             log.warning("Keine Download-URL für %s", fname)
-            stats["errors"] += 1
-            return
+            return False
         url = version_info["url"]
     except Exception as exc:
         log.error("Fehler beim Abrufen der Version für %s: %s", fname, exc)
-        stats["errors"] += 1
-        return
+        return False
 
     # Stream download via the iCloud session (handles auth cookies)
     response = None
@@ -988,24 +1299,22 @@ def _download_photo(photo, local_path: Path, stats: dict) -> None:
         response.raise_for_status()
     except Exception as exc:
         log.error("Download-Fehler für %s: %s", fname, exc)
-        stats["errors"] += 1
         if response is not None:
             response.close()
-        return
+        return False
 
     tmp_path = local_path.with_suffix(local_path.suffix + ".tmp")
     try:
         with open(tmp_path, "wb") as fh:
-            for chunk in response.iter_content(chunk_size=256 * 1024):
+            for chunk in response.iter_content(chunk_size=_COPY_CHUNK_SIZE):
                 if chunk:
                     fh.write(chunk)
-        tmp_path.rename(local_path)
+        os.replace(tmp_path, local_path)
     except Exception as exc:
         log.error("Schreibfehler für %s: %s", local_path.name, exc)
         if tmp_path.exists():
             tmp_path.unlink()
-        stats["errors"] += 1
-        return
+        return False
     finally:
         response.close()
 
@@ -1019,38 +1328,45 @@ def _download_photo(photo, local_path: Path, stats: dict) -> None:
             pass
 
     log.info("Foto heruntergeladen: %s", local_path.name)
-    stats["downloaded"] += 1
+    return True
 
 
-def _process_photo(photo, dest_path: Path, excludes: list[str] | None,
+def _process_photo(photo, dest_path: Path, excludes: CompiledExcludes | None,
                    stats: dict, dry_run: bool,
-                   photo_cache: dict | None = None) -> tuple[str | None, bool]:
-    """Process a single photo: check exclusions, skip/download.
+                   photo_cache: dict | None = None,
+                   claimed: set[Path] | None = None,
+                   made_dirs: set[Path] | None = None,
+                   ) -> tuple[str | None, bool, Path | None, datetime | None]:
+    """Process a single photo: check exclusions and decide whether to download.
 
     When *photo_cache* is provided, fingerprints (resOriginalFingerprint or
     recordChangeTag) are used for change detection in addition to file size.
-    Returns ``(filename, was_skipped)`` – *was_skipped* is True when the
-    photo already existed locally and was not re-downloaded.
+    *claimed* holds target paths of downloads still in flight, which count
+    as taken when resolving filename collisions; *made_dirs* remembers the
+    date folders already created during this run.
+    Returns ``(filename, was_skipped, download_path, dt)`` – *was_skipped*
+    is True when the photo already existed locally and was not re-downloaded;
+    *download_path* is where the caller should download it to, if anywhere;
+    *dt* is the photo date that picked its subfolder.
     """
     filename = getattr(photo, "filename", None)
     if not filename:
-        return None, False
+        return None, False, None, None
 
+    dt = _photo_date(photo)
     if excludes and is_excluded(filename, excludes):
-        return filename, False
+        return filename, False, None, dt
 
     # Organise into date-based subfolders: YYYY/MM/DD
-    dt = _photo_date(photo)
-    if dt:
-        sub = dest_path / f"{dt:%Y}" / f"{dt:%m}" / f"{dt:%d}"
-    else:
-        sub = dest_path / "unknown_date"
-    sub.mkdir(parents=True, exist_ok=True)
-
+    sub = _date_dir(dest_path, dt.year, dt.month, dt.day) if dt else dest_path / "unknown_date"
     local_path = sub / filename
 
     # --- Change detection ---
-    if local_path.exists():
+    try:
+        local_stat = os.stat(local_path)
+    except OSError:
+        local_stat = None
+    if local_stat is not None:
         photo_id = getattr(photo, "id", None)
         remote_fp = _photo_fingerprint(photo)
 
@@ -1060,44 +1376,42 @@ def _process_photo(photo, dest_path: Path, excludes: list[str] | None,
             if cached_fp and cached_fp == remote_fp:
                 log.debug("Photo-Cache-Hit (fingerprint unverändert): %s", filename)
                 stats["skipped"] += 1
-                return filename, True
+                return filename, True, None, dt
 
         # 2) Fallback: size comparison
         remote_size = getattr(photo, "size", None)
         if remote_size is not None:
-            if local_path.stat().st_size == remote_size:
+            if local_stat.st_size == remote_size:
                 # Size matches – update cache entry and skip
                 if photo_cache is not None and photo_id and remote_fp:
                     photo_cache[str(photo_id)] = remote_fp
                 stats["skipped"] += 1
-                return filename, True
+                return filename, True, None, dt
             # Size mismatch → re-download (handled below)
         else:
             # No remote size and no fingerprint match → trust file existence
             if not remote_fp:
                 log.debug("Kein remote_size/fingerprint für %s, überspringe (Datei existiert)", filename)
                 stats["skipped"] += 1
-                return filename, True
+                return filename, True, None, dt
 
     if dry_run:
         log.info("[DRY RUN] Würde herunterladen: %s", filename)
         stats["downloaded"] += 1
-        return filename, False
-
-    # Handle filename collisions (different photo, same name)
-    if local_path.exists():
-        local_path = _unique_path(local_path)
+        return filename, False, None, dt
 
-    _download_photo(photo, local_path, stats)
+    # The folder only needs creating when the file is not there yet
+    if local_stat is None and (made_dirs is None or sub not in made_dirs):
+        sub.mkdir(parents=True, exist_ok=True)
+        if made_dirs is not None:
+            made_dirs.add(sub)
 
-    # Update cache after successful download
-    if photo_cache is not None:
-        photo_id = getattr(photo, "id", None)
-        remote_fp = _photo_fingerprint(photo)
-        if photo_id and remote_fp:
-            photo_cache[str(photo_id)] = remote_fp
+    # Handle filename collisions (different photo, same name)
+    claimed = claimed or set()
+    if local_stat is not None or local_path in claimed:
+        local_path = _unique_path(local_path, claimed)
 
-    return filename, False
+    return filename, False, local_path, dt
 
 
 def _reconcile_photos(
@@ -1114,17 +1428,29 @@ def _reconcile_photos(
     if not local_dir.exists():
         return
 
-    for local_file in local_dir.rglob("*"):
-        if not local_file.is_file() or local_file.name.endswith(".tmp"):
-            continue
-        rel = str(local_file.relative_to(local_dir))
-        if rel not in remote_files:
-            _apply_sync_policy(local_file, rel, sync_policy, archive_dest, stats)
+    _reconcile_tree(local_dir, remote_files, sync_policy, archive_dest, stats)
+
+
+# Photo records are freed by reference counting as the iteration moves on;
+# a full collection only pays off when memory actually runs high (the
+# container default is 512 MB), so it is gated on the resident set size.
+_GC_CHECK_INTERVAL = 500
+_GC_RSS_THRESHOLD = 256 * 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size, or 0 if it is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
 
-    # Clean up empty directories
-    for dirpath in sorted(local_dir.rglob("*"), reverse=True):
-        if dirpath.is_dir() and not any(dirpath.iterdir()):
-            dirpath.rmdir()
+
+# The photo cache is written once per library, plus a checkpoint after
+# this many new entries; the write happens on a background thread.
+_PHOTO_CACHE_CHECKPOINT = 1000
 
 
 def _backup_photo_library(
@@ -1156,38 +1482,88 @@ def _backup_photo_library(
     photo_cache = _load_photo_cache(destination, label) if destination else {}
     cache_size_before = len(photo_cache)
 
-    try:
-        for photo in library_photos:
-            _check_cancel(config_id)
-            fname, was_skipped = _process_photo(
-                photo, dest_dir, excludes, stats, dry_run,
-                photo_cache=photo_cache,
-            )
-            processed += 1
-            current_file = fname or current_file
-            if fname:
-                dt = _photo_date(photo)
-                if dt:
-                    rel = f"{dt:%Y}/{dt:%m}/{dt:%d}/{fname}"
-                else:
-                    rel = f"unknown_date/{fname}"
-                remote_files.add(rel)
-            if processed % 50 == 0:
-                gc.collect()
-            if config_id is not None:
-                _set_progress(config_id, {
-                    "phase": "photos",
-                    "folder": label,
-                    "current_file": current_file,
-                    "processed": processed,
-                    **stats,
-                })
-    except BackupCancelled:
-        raise
-    except Exception as exc:
-        log.error("Fehler beim Iterieren von %s: %s", label, exc)
-        stats["errors"] += 1
-        had_errors = True
+    compiled_excludes = compile_excludes(excludes)
+
+    # Downloads overlap on a pool (see sync_drive_folder); stats and the
+    # photo cache are only updated from this thread.
+    pending: dict[Future, tuple[object, Path]] = {}
+    made_dirs: set[Path] = set()
+    unsaved = 0
+
+    def _collect(done) -> None:
+        nonlocal unsaved
+        for future in done:
+            photo, local_path = pending.pop(future)
+            if not future.result():
+                stats["errors"] += 1
+                continue
+            stats["downloaded"] += 1
+            # Update cache after successful download
+            if photo_cache is not None:
+                photo_id = getattr(photo, "id", None)
+                remote_fp = _photo_fingerprint(photo)
+                if photo_id and remote_fp:
+                    photo_cache[str(photo_id)] = remote_fp
+                    unsaved += 1
+        # Checkpoint so an aborted run does not re-download everything
+        if destination and unsaved >= _PHOTO_CACHE_CHECKPOINT:
+            _save_photo_cache(destination, label, photo_cache)
+            unsaved = 0
+
+    with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS, thread_name_prefix="photos-dl") as pool:
+        try:
+            for photo in library_photos:
+                _check_cancel(config_id)
+                fname, was_skipped, download_path, dt = _process_photo(
+                    photo, dest_dir, compiled_excludes, stats, dry_run,
+                    photo_cache=photo_cache,
+                    claimed={path for _, path in pending.values()},
+                    made_dirs=made_dirs,
+                )
+                if download_path is not None:
+                    if len(pending) >= 2 * _DOWNLOAD_WORKERS:
+                        _collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    pending[pool.submit(_download_photo, photo, download_path, config_id)] = (photo, download_path)
+                processed += 1
+                current_file = fname or current_file
+                if fname:
+                    if dt:
+                        rel = f"{dt.year:04d}/{dt.month:02d}/{dt.day:02d}/{fname}"
+                    else:
+                        rel = f"unknown_date/{fname}"
+                    remote_files.add(rel)
+                if processed % _GC_CHECK_INTERVAL == 0 and _rss_bytes() > _GC_RSS_THRESHOLD:
+                    gc.collect()
+                if config_id is not None and _progress_due(config_id):
+                    _set_progress(config_id, {
+                        "phase": "photos",
+                        "folder": label,
+                        "current_file": current_file,
+                        "processed": processed,
+                        **stats,
+                    })
+            while pending:
+                _collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        except BackupCancelled:
+            pool.shutdown(cancel_futures=True)
+            # Every cache entry belongs to a verified local file, so keep them
+            if destination and photo_cache:
+                _save_photo_cache(destination, label, photo_cache)
+            raise
+        except Exception as exc:
+            log.error("Fehler beim Iterieren von %s: %s", label, exc)
+            stats["errors"] += 1
+            had_errors = True
+    # Downloads still in flight when iteration failed have finished by now
+    _collect(list(pending))
+    if config_id is not None:
+        _set_progress(config_id, {
+            "phase": "photos",
+            "folder": label,
+            "current_file": current_file,
+            "processed": processed,
+            **stats,
+        })
 
     log.info(
         "%s abgeschlossen: %d verarbeitet, %d heruntergeladen, "
@@ -1271,9 +1647,36 @@ def run_photos_backup(
     return stats
 
 
+def _tree_usage(path: str) -> tuple[int, int]:
+    """Return ``(file count, total bytes)`` of all files below *path*."""
+    count = 0
+    total_size = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+                        total_size += entry.stat().st_size
+                except OSError:
+                    pass
+    return count, total_size
+
+
 def get_backup_storage_stats(destination: str) -> dict:
     """Scan local backup directories and return file counts and sizes.
 
+    Top-level folders of each category are scanned in parallel; the walk
+    uses ``os.scandir`` so directory entries are classified without a
+    separate stat call.
+
     Returns::
 
         {
@@ -1283,21 +1686,34 @@ def get_backup_storage_stats(destination: str) -> dict:
     """
     base = settings.backup_path / destination
     result = {}
-    for subdir in ("photos", "drive", "contacts", "calendar"):
-        path = base / subdir
-        if not path.exists():
-            result[subdir] = {"count": 0, "size_bytes": 0}
-            continue
-        count = 0
-        total_size = 0
-        for f in path.rglob("*"):
-            if f.is_file():
-                count += 1
-                try:
-                    total_size += f.stat().st_size
-                except OSError:
-                    pass
-        result[subdir] = {"count": count, "size_bytes": total_size}
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        pending = {}
+        for subdir in ("photos", "drive", "contacts", "calendar"):
+            count = 0
+            total_size = 0
+            futures = []
+            try:
+                entries = os.scandir(base / subdir)
+            except OSError:
+                entries = None
+            if entries is not None:
+                with entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                futures.append(pool.submit(_tree_usage, entry.path))
+                            elif entry.is_file():
+                                count += 1
+                                total_size += entry.stat().st_size
+                        except OSError:
+                            pass
+            pending[subdir] = (count, total_size, futures)
+        for subdir, (count, total_size, futures) in pending.items():
+            for future in futures:
+                sub_count, sub_size = future.result()
+                count += sub_count
+                total_size += sub_size
+            result[subdir] = {"count": count, "size_bytes": total_size}
     return result
 
 
@@ -1474,7 +1890,7 @@ def run_contacts_backup(
     old_hashes: dict[str, str] = {}
     if cache_file.exists():
         try:
-            old_hashes = json.loads(cache_file.read_text())
+            old_hashes = orjson.loads(cache_file.read_bytes())
         except Exception:
             pass
 
@@ -1496,7 +1912,7 @@ def run_contacts_backup(
         last = contact.get("lastName", "")
         display = f"{first} {last}".strip() or contact.get("companyName", "") or contact_id
 
-        if config_id is not None:
+        if config_id is not None and _progress_due(config_id):
             _set_progress(config_id, {
                 "phase": "contacts",
                 "folder": "",
@@ -1538,6 +1954,16 @@ def run_contacts_backup(
             log.error("Fehler beim Verarbeiten von Kontakt '%s': %s", display, exc)
             stats["errors"] += 1
 
+    if config_id is not None:
+        _set_progress(config_id, {
+            "phase": "contacts",
+            "folder": "",
+            "current_file": "all_contacts.vcf",
+            "downloaded": stats["downloaded"],
+            "skipped": stats["skipped"],
+            "errors": stats["errors"],
+        })
+
     # Write combined VCF
     try:
         combined_path = dest_path / "all_contacts.vcf"
@@ -1563,15 +1989,19 @@ def run_contacts_backup(
         current_files.add("all_contacts.vcf")
         current_files.add("contacts.json")
         archive_dest = settings.archive_path / destination / "contacts"
-        for existing in dest_path.iterdir():
-            if existing.is_file() and existing.name.lower() not in current_files:
-                _apply_sync_policy(
-                    existing, existing.name, sync_policy, archive_dest, stats,
-                )
+        with os.scandir(dest_path) as entries:
+            orphans = [
+                entry.name for entry in entries
+                if entry.is_file() and entry.name.lower() not in current_files
+            ]
+        for name in orphans:
+            _apply_sync_policy(
+                dest_path / name, name, sync_policy, archive_dest, stats,
+            )
 
     # Save hash cache
     try:
-        cache_file.write_text(json.dumps(new_hashes, ensure_ascii=False))
+        cache_file.write_bytes(orjson.dumps(new_hashes))
     except Exception:
         pass
 
@@ -1775,7 +2205,7 @@ def run_calendar_backup(
     old_hashes: dict[str, str] = {}
     if cache_file.exists():
         try:
-            old_hashes = json.loads(cache_file.read_text())
+            old_hashes = orjson.loads(cache_file.read_bytes())
         except Exception:
             pass
 
@@ -1872,17 +2302,18 @@ def run_calendar_backup(
         stats["errors"] += 1
 
     # Remove stale .ics files for deleted calendars
-    for existing in dest_path.iterdir():
-        if existing.is_file() and existing.name not in written_files:
-            try:
-                existing.unlink()
-                log.debug("Gelöschten Kalender entfernt: %s", existing.name)
-            except OSError:
-                pass
+    with os.scandir(dest_path) as entries:
+        stale = [entry for entry in entries if entry.is_file() and entry.name not in written_files]
+    for entry in stale:
+        try:
+            os.unlink(entry.path)
+            log.debug("Gelöschten Kalender entfernt: %s", entry.name)
+        except OSError:
+            pass
 
     # Save hash cache
     try:
-        cache_file.write_text(json.dumps(new_hashes, ensure_ascii=False))
+        cache_file.write_bytes(orjson.dumps(new_hashes))
     except Exception:
         pass
 
@@ -1897,28 +2328,55 @@ def run_calendar_backup(
 # Combined backup runner
 # ---------------------------------------------------------------------------
 
-def run_backup(
-    apple_id: str,
-    backup_drive: bool = False,
-    backup_photos: bool = False,
-    backup_contacts: bool = False,
-    backup_calendar: bool = False,
-    drive_folders: list[str] | None = None,
-    photos_include_family: bool = False,
-    shared_library_id: str | None = None,
-    destination: str = "",
-    exclusions: list[str] | None = None,
-    dry_run: bool = False,
-    config_id: str | None = None,
-    contacts_sync_policy: str = SyncPolicy.ARCHIVE,
-    drive_sync_policy: str = SyncPolicy.DELETE,
-    photos_sync_policy: str = SyncPolicy.KEEP,
-) -> dict:
+@dataclass(slots=True)
+class RunBackupArgs:
+    """Parameters of one :func:`run_backup` call, mirroring a backup config."""
+
+    apple_id: str
+    backup_drive: bool = False
+    backup_photos: bool = False
+    backup_contacts: bool = False
+    backup_calendar: bool = False
+    drive_folders: list[str] | None = None
+    photos_include_family: bool = False
+    shared_library_id: str | None = None
+    destination: str = ""
+    exclusions: list[str] | None = None
+    dry_run: bool = False
+    config_id: str | None = None
+    contacts_sync_policy: str = SyncPolicy.ARCHIVE
+    drive_sync_policy: str = SyncPolicy.DELETE
+    photos_sync_policy: str = SyncPolicy.KEEP
+
+    @classmethod
+    def from_config(cls, apple_id: str, cfg: dict, folders: list[str]) -> "RunBackupArgs":
+        """Build the arguments for a tracked backup of *apple_id* from its config."""
+        return cls(
+            apple_id=apple_id,
+            backup_drive=cfg.get("backup_drive", False),
+            backup_photos=cfg.get("backup_photos", False),
+            backup_contacts=cfg.get("backup_contacts", False),
+            backup_calendar=cfg.get("backup_calendar", False),
+            drive_folders=folders,
+            photos_include_family=cfg.get("photos_include_family", False),
+            shared_library_id=cfg.get("shared_library_id"),
+            destination=cfg.get("destination", ""),
+            exclusions=cfg.get("exclusions"),
+            config_id=apple_id,
+            contacts_sync_policy=cfg.get("contacts_sync_policy", SyncPolicy.ARCHIVE),
+            drive_sync_policy=cfg.get("drive_sync_policy", SyncPolicy.DELETE),
+            photos_sync_policy=cfg.get("photos_sync_policy", SyncPolicy.KEEP),
+        )
+
+
+def run_backup(args: RunBackupArgs) -> dict:
     """Run a complete backup for one account based on its configuration."""
+    apple_id, destination, exclusions = args.apple_id, args.destination, args.exclusions
+    dry_run, config_id = args.dry_run, args.config_id
     result = {"drive_stats": None, "photos_stats": None, "contacts_stats": None, "calendar_stats": None, "success": True, "message": ""}
 
     if not destination:
-        destination = apple_id.replace("@", "_at_").replace(".", "_")
+        destination = default_destination(apple_id)
 
     # Early session check – abort with a clear message when the token
     # has expired so callers can send the appropriate notification.
@@ -1940,40 +2398,41 @@ def run_backup(
         })
 
     cancelled = False
+    _run_writes.writers = []
     try:
-        if backup_drive and drive_folders:
+        if args.backup_drive and args.drive_folders:
             log.info("Starte iCloud Drive Backup für %s", apple_id)
             drive_stats = run_drive_backup(
-                apple_id, drive_folders, destination, exclusions, dry_run, config_id,
-                sync_policy=drive_sync_policy,
+                apple_id, args.drive_folders, destination, exclusions, dry_run, config_id,
+                sync_policy=args.drive_sync_policy,
             )
             result["drive_stats"] = drive_stats
             if drive_stats["errors"] > 0:
                 result["success"] = False
 
-        if backup_photos:
+        if args.backup_photos:
             log.info("Starte iCloud Fotos Backup für %s", apple_id)
             photos_stats = run_photos_backup(
-                apple_id, destination, photos_include_family,
-                shared_library_id=shared_library_id,
+                apple_id, destination, args.photos_include_family,
+                shared_library_id=args.shared_library_id,
                 excludes=exclusions, dry_run=dry_run, config_id=config_id,
-                sync_policy=photos_sync_policy,
+                sync_policy=args.photos_sync_policy,
             )
             result["photos_stats"] = photos_stats
             if photos_stats["errors"] > 0:
                 result["success"] = False
 
-        if backup_contacts:
+        if args.backup_contacts:
             log.info("Starte iCloud Kontakte Backup für %s", apple_id)
             contacts_stats = run_contacts_backup(
                 apple_id, destination, config_id=config_id,
-                sync_policy=contacts_sync_policy,
+                sync_policy=args.contacts_sync_policy,
             )
             result["contacts_stats"] = contacts_stats
             if contacts_stats["errors"] > 0:
                 result["success"] = False
 
-        if backup_calendar:
+        if args.backup_calendar:
             log.info("Starte iCloud Kalender Backup für %s", apple_id)
             calendar_stats = run_calendar_backup(
                 apple_id, destination, config_id=config_id,
@@ -1986,6 +2445,8 @@ def run_backup(
         log.info("Backup für %s wurde vom Benutzer abgebrochen.", apple_id)
         result["success"] = False
     finally:
+        writers, _run_writes.writers = _run_writes.writers, None
+        _join_cache_writes(writers)
         if config_id is not None:
             _clear_progress(config_id)
 
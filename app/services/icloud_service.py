@@ -2,10 +2,12 @@
 
 import logging
 import re
+import threading
 from pathlib import Path
 
 from pyicloud import PyiCloudService
 from pyicloud.exceptions import PyiCloudFailedLoginException
+from requests.adapters import HTTPAdapter
 
 from app.config import settings
 
@@ -22,6 +24,46 @@ _trusted_devices: dict[str, list[dict]] = {}
 _user_records: dict[str, str] = {}
 
 
+# Keep-alive connections per host.  Backups download Drive files and photos
+# on pools of DOWNLOAD_CONCURRENCY threads while Drive listings are
+# prefetched on four more, which would overflow requests' default of ten
+# and make every surplus request pay a fresh TLS handshake.
+_HTTP_POOL_SIZE = max(16, settings.download_concurrency + 4)
+
+
+def _serialize_session_saves(session) -> None:
+    """Let only one thread at a time persist *session*.
+
+    pyicloud saves the session JSON (non-atomically) and the cookie jar
+    after every request; download threads sharing the session would
+    otherwise interleave those writes and could corrupt the saved login.
+    """
+    if getattr(session, "_backup_save_lock", None) is not None:
+        return
+    lock = threading.Lock()
+    save = session._save_session_data
+
+    def _locked_save() -> None:
+        with lock:
+            save()
+
+    session._backup_save_lock = lock
+    session._save_session_data = _locked_save
+
+
+def _remember_session(apple_id: str, api: PyiCloudService) -> None:
+    """Cache *api* for *apple_id*, ready to be shared by the download threads."""
+    _serialize_session_saves(api.session)
+    adapter = api.session.get_adapter("https://")
+    if getattr(adapter, "_pool_maxsize", 0) < _HTTP_POOL_SIZE:
+        # Keep pyicloud's retry policy; only the pool gets bigger
+        api.session.mount("https://", HTTPAdapter(
+            pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE,
+            max_retries=adapter.max_retries, pool_block=getattr(adapter, "_pool_block", False),
+        ))
+    _sessions[apple_id] = api
+
+
 def _cookie_dir_for(apple_id: str) -> str:
     """Return a per-account cookie directory path."""
     safe_name = re.sub(r"[^\w]", "_", apple_id)
@@ -54,7 +96,7 @@ def authenticate(apple_id: str, password: str | None = None) -> dict:
     except Exception as exc:
         return {"status": "error", "message": f"Verbindungsfehler: {exc}"}
 
-    _sessions[apple_id] = api
+    _remember_session(apple_id, api)
 
     if api.requires_2fa:
         return {
@@ -324,7 +366,7 @@ def get_session(apple_id: str) -> PyiCloudService | None:
             verify=True,
         )
         if not api.requires_2fa and not api.requires_2sa:
-            _sessions[apple_id] = api
+            _remember_session(apple_id, api)
             return api
     except Exception:
         pass
@@ -538,7 +580,7 @@ def check_connection(apple_id: str) -> dict:
         }
 
     if api.requires_2fa or api.requires_2sa:
-        _sessions[apple_id] = api
+        _remember_session(apple_id, api)
         return {
             "valid": False,
             "message": "Token abgelaufen – Zwei-Faktor-Authentifizierung erforderlich.",
@@ -556,7 +598,7 @@ def check_connection(apple_id: str) -> dict:
             "requires_2fa": False,
         }
 
-    _sessions[apple_id] = api
+    _remember_session(apple_id, api)
     return {
         "valid": True,
         "message": "Verbindung aktiv – Token ist gültig.",
@@ -2,12 +2,13 @@
 
 import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 
 from app import config_store
+from app.cron import cron_trigger
 from app.services import backup_service
 from app.services.notification import notify_backup_result, notify_token_expired, notify_token_expiring
 
@@ -20,15 +21,13 @@ scheduler = AsyncIOScheduler(job_defaults={"misfire_grace_time": 3600})
 
 _BACKUP_JOB_ID = "backup_all"
 
+# Accounts whose scheduled backup (including post-processing) is underway
+_active_jobs: set[str] = set()
 
-def _parse_folders(cfg: dict) -> list[str]:
-    """Extract the list of drive folders from a backup config dict."""
-    if cfg.get("drive_config_mode", "simple") == "simple":
-        return cfg.get("drive_folders_simple") or []
-    else:
-        # Advanced mode: one path per line
-        text = cfg.get("drive_folders_advanced") or ""
-        return [line.strip() for line in text.splitlines() if line.strip()]
+
+def is_job_active(apple_id: str) -> bool:
+    """Return True while a scheduled backup for *apple_id* is running."""
+    return apple_id in _active_jobs
 
 
 async def _run_backup_job(apple_id: str) -> None:
@@ -46,37 +45,33 @@ async def _run_backup_job(apple_id: str) -> None:
         log.warning("Keine Backup-Konfiguration für %s", apple_id)
         return
 
-    config_store.update_backup_status(
-        apple_id,
-        status="running",
-        at=datetime.utcnow().isoformat(),
-    )
+    # Registered until the final status is written, so the phantom-run
+    # guard and manual triggers see the job even after its progress ended
+    _active_jobs.add(apple_id)
+    try:
+        await _execute_job(apple_id, cfg)
+    finally:
+        _active_jobs.discard(apple_id)
+
+
+async def _execute_job(apple_id: str, cfg: dict) -> None:
+    """Run one scheduled backup, then persist its result and notify."""
+    # Kept in memory only; the final status below persists it
+    start_time, start_clock = datetime.now(timezone.utc), time.monotonic()
+    config_store.mark_running(apple_id, started_at=start_time.isoformat())
 
     # Run the actual backup in a thread to avoid blocking the event loop
     try:
-        folders = _parse_folders(cfg)
+        folders = config_store.drive_folders(cfg)
         result = await asyncio.to_thread(
             backup_service.run_backup,
-            apple_id=apple_id,
-            backup_drive=cfg.get("backup_drive", False),
-            backup_photos=cfg.get("backup_photos", False),
-            backup_contacts=cfg.get("backup_contacts", False),
-            backup_calendar=cfg.get("backup_calendar", False),
-            drive_folders=folders,
-            photos_include_family=cfg.get("photos_include_family", False),
-            shared_library_id=cfg.get("shared_library_id"),
-            destination=cfg.get("destination", ""),
-            exclusions=cfg.get("exclusions"),
-            config_id=apple_id,
-            contacts_sync_policy=cfg.get("contacts_sync_policy", "archive"),
-            drive_sync_policy=cfg.get("drive_sync_policy", "delete"),
-            photos_sync_policy=cfg.get("photos_sync_policy", "keep"),
+            backup_service.RunBackupArgs.from_config(apple_id, cfg, folders),
         )
 
         status = "success" if result["success"] else "error"
         message = result["message"]
-        dest = cfg.get("destination", "") or apple_id.replace("@", "_at_").replace(".", "_")
-        storage = backup_service.get_backup_storage_stats(dest)
+        dest = cfg.get("destination", "") or config_store.default_destination(apple_id)
+        storage = await asyncio.to_thread(backup_service.get_backup_storage_stats, dest)
         stats = {
             "drive": result.get("drive_stats"),
             "photos": result.get("photos_stats"),
@@ -96,7 +91,12 @@ async def _run_backup_job(apple_id: str) -> None:
         message = str(exc)
         stats = None
 
-    config_store.update_backup_status(apple_id, status=status, message=message, stats=stats)
+    elapsed = time.monotonic() - start_clock
+    config_store.update_backup_status(
+        apple_id, status=status, message=message, stats=stats,
+        at=(start_time + timedelta(seconds=elapsed)).isoformat(),
+        duration_seconds=round(elapsed),
+    )
     notify_backup_result(apple_id, status, message)
 
 
@@ -161,17 +161,9 @@ async def sync_scheduled_jobs() -> None:
 
     cron_expr = schedule.get("cron") or "0 2 * * *"
     try:
-        parts = cron_expr.split()
-        trigger = CronTrigger(
-            minute=parts[0] if len(parts) > 0 else "0",
-            hour=parts[1] if len(parts) > 1 else "2",
-            day=parts[2] if len(parts) > 2 else "*",
-            month=parts[3] if len(parts) > 3 else "*",
-            day_of_week=parts[4] if len(parts) > 4 else "*",
-        )
         scheduler.add_job(
             _run_all_backups,
-            trigger=trigger,
+            trigger=cron_trigger(cron_expr),
             id=_BACKUP_JOB_ID,
             replace_existing=True,
             name="Backup alle Accounts",
@@ -1,19 +1,25 @@
 """Tests for FastAPI API endpoints."""
 
+import logging
+
 import pytest
 import pytest_asyncio
 from unittest.mock import patch, MagicMock
+from fastapi import HTTPException
+from pydantic import ValidationError
 from httpx import AsyncClient, ASGITransport
 
-from app.main import app
+from app.main import _HealthCheckFilter, app
 from app import config_store
+from app.routers.deps import require_account, require_account_with_config
+from app.schemas import ScheduleUpdate
 
 
 @pytest_asyncio.fixture
 async def client(tmp_path, monkeypatch):
-    """Create a test client with a temporary YAML config."""
+    """Create a test client with a temporary JSON config."""
     # Point config_store to a temp file
-    monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.yaml")
+    monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.json")
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -31,6 +37,59 @@ class TestHealthEndpoint:
         assert {"version", "commit", "build_date"}.issubset(data["build"].keys())
 
 
+class TestHealthCheckFilter:
+    @staticmethod
+    def _record(method, path):
+        return logging.LogRecord(
+            "uvicorn.access", logging.INFO, __file__, 0,
+            '%s - "%s %s HTTP/%s" %d', ("127.0.0.1:1", method, path, "1.1", 200), None,
+        )
+
+    def test_health_suppressed(self):
+        assert not _HealthCheckFilter().filter(self._record("GET", "/health"))
+
+    def test_other_requests_kept(self):
+        assert _HealthCheckFilter().filter(self._record("GET", "/api/backup/progress"))
+        assert _HealthCheckFilter().filter(self._record("POST", "/health"))
+
+
+class TestRequireAccount:
+    def test_missing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.json")
+        with pytest.raises(HTTPException) as exc:
+            require_account("nobody@icloud.com")
+        assert exc.value.status_code == 404
+
+    def test_not_authenticated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.json")
+        config_store.add_account("a@icloud.com", status="pending")
+        assert require_account("a@icloud.com")["status"] == "pending"
+        with pytest.raises(HTTPException) as exc:
+            require_account("a@icloud.com", authenticated=True)
+        assert exc.value.status_code == 400
+
+    def test_with_config(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.json")
+        config_store.add_account("a@icloud.com", status="authenticated")
+        config_store.save_backup_config("a@icloud.com", {"backup_photos": True})
+        account, cfg = require_account_with_config("a@icloud.com", authenticated=True)
+        assert account["status"] == "authenticated"
+        assert cfg["backup_photos"] is True
+        with pytest.raises(HTTPException) as exc:
+            require_account_with_config("nobody@icloud.com")
+        assert exc.value.status_code == 404
+
+
+class TestScheduleUpdate:
+    def test_cron_normalized(self):
+        assert ScheduleUpdate(enabled=True, cron=" 0  3 * * 1-5 ").cron == "0 3 * * 1-5"
+
+    @pytest.mark.parametrize("cron", ["99 * * * *", "0 2 * * * *", "x y"])
+    def test_invalid_cron_rejected(self, cron):
+        with pytest.raises(ValidationError):
+            ScheduleUpdate(enabled=True, cron=cron)
+
+
 class TestAccountsAPI:
     @pytest.mark.asyncio
     async def test_list_empty(self, client):
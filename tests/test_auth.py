@@ -0,0 +1,134 @@
+"""Tests for session cookie signing and verification."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app import auth
+from app.auth import (
+    _COOKIE_NAME, _SESSION_MAX_AGE, _sign, AuthMiddleware, create_session_cookie,
+    forget_session_cookie, verify_session_cookie,
+)
+
+
+class TestSessionCookie:
+    def test_roundtrip(self):
+        cookie = create_session_cookie()
+        assert verify_session_cookie(cookie)
+
+    def test_signature_is_stable(self):
+        assert _sign("1700000000") == _sign("1700000000")
+        assert _sign("1700000000") != _sign("1700000001")
+
+    def test_tampered_signature(self):
+        ts, sig = create_session_cookie().rsplit(".", 1)
+        bad = "0" * len(sig) if sig != "0" * len(sig) else "1" * len(sig)
+        assert not verify_session_cookie(f"{ts}.{bad}")
+
+    def test_tampered_timestamp(self):
+        ts, sig = create_session_cookie().rsplit(".", 1)
+        assert not verify_session_cookie(f"{int(ts) - 1}.{sig}")
+
+    def test_expired(self):
+        ts = str(int(time.time()) - _SESSION_MAX_AGE - 10)
+        assert not verify_session_cookie(f"{ts}.{_sign(ts)}")
+
+    def test_garbage(self):
+        assert not verify_session_cookie("")
+        assert not verify_session_cookie("no-dot-here")
+        assert not verify_session_cookie("abc.def")
+
+    def test_wrong_shape(self):
+        cookie = create_session_cookie()
+        assert not verify_session_cookie(cookie + "0")
+        assert not verify_session_cookie(cookie[:-1])
+        assert not verify_session_cookie(cookie.replace(".", "-"))
+        assert not verify_session_cookie("a" * 10 + cookie[10:])
+        assert not verify_session_cookie("ä" + cookie[1:])
+
+
+class TestCookieCache:
+    def setup_method(self):
+        auth._cookie_cache.clear()
+
+    def test_hit_skips_hmac(self):
+        cookie = create_session_cookie()
+        assert verify_session_cookie(cookie)
+        with patch("app.auth._sign", side_effect=AssertionError("HMAC recomputed")):
+            assert verify_session_cookie(cookie)
+
+    def test_invalid_cookie_not_cached(self):
+        assert not verify_session_cookie("123.abc")
+        assert "123.abc" not in auth._cookie_cache
+
+    def test_cached_entry_expires(self):
+        cookie = create_session_cookie()
+        assert verify_session_cookie(cookie)
+        auth._cookie_cache[cookie] = time.time() - 1
+        assert not verify_session_cookie(cookie)
+        assert cookie not in auth._cookie_cache
+
+    def test_forget(self):
+        cookie = create_session_cookie()
+        verify_session_cookie(cookie)
+        forget_session_cookie(cookie)
+        assert cookie not in auth._cookie_cache
+
+    def test_bounded(self, monkeypatch):
+        monkeypatch.setattr(auth, "_COOKIE_CACHE_SIZE", 2)
+        now = int(time.time())
+        cookies = [f"{ts}.{_sign(str(ts))}" for ts in (now - 3, now - 2, now - 1)]
+        for cookie in cookies:
+            assert verify_session_cookie(cookie)
+        assert list(auth._cookie_cache) == cookies[1:]
+
+
+class TestAuthMiddleware:
+    @pytest_asyncio.fixture
+    async def client(self):
+        async def ok(request):
+            return PlainTextResponse("ok")
+
+        app = AuthMiddleware(Starlette(routes=[
+            Route("/", ok), Route("/health", ok), Route("/healthz", ok), Route("/api/things", ok),
+        ]))
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_public_path(self, client):
+        assert (await client.get("/health")).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_public_paths_match_exactly(self, client):
+        assert (await client.get("/healthz")).status_code == 302
+
+    @pytest.mark.asyncio
+    async def test_api_unauthorized(self, client):
+        res = await client.get("/api/things")
+        assert res.status_code == 401
+        assert res.json() == {"detail": "Nicht authentifiziert."}
+
+    @pytest.mark.asyncio
+    async def test_page_redirects_to_login(self, client):
+        res = await client.get("/")
+        assert res.status_code == 302
+        assert res.headers["location"] == "/login"
+
+    @pytest.mark.asyncio
+    async def test_valid_cookie(self, client):
+        client.cookies.set(_COOKIE_NAME, create_session_cookie())
+        assert (await client.get("/api/things")).text == "ok"
+        assert (await client.get("/")).text == "ok"
+
+    @pytest.mark.asyncio
+    async def test_invalid_cookie(self, client):
+        client.cookies.set(_COOKIE_NAME, "123.abc")
+        assert (await client.get("/api/things")).status_code == 401
@@ -0,0 +1,135 @@
+"""Tests for background execution of manually triggered backups."""
+
+import asyncio
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.routers import backup
+from app.services import scheduler
+
+
+class TestBackgroundBackups:
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(backup, "_backup_slots", asyncio.Semaphore(2))
+        running = 0
+        peak = 0
+        release = asyncio.Event()
+
+        async def run():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+        for i in range(4):
+            backup._start_background(f"user{i}@icloud.com", run)
+        await asyncio.sleep(0)
+        assert peak == 2
+        assert len(backup._running_tasks) == 4
+        assert len(backup._queued_backups) == 2
+
+        release.set()
+        await asyncio.gather(*backup._running_tasks.values())
+        assert peak == 2
+        assert not backup._running_tasks
+        assert not backup._queued_backups
+
+    @pytest.mark.asyncio
+    async def test_failed_run_releases_account(self):
+        async def run():
+            raise RuntimeError("boom")
+
+        backup._start_background("a@icloud.com", run)
+        await asyncio.gather(*backup._running_tasks.values(), return_exceptions=True)
+        assert "a@icloud.com" not in backup._running_tasks
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_backup(self, monkeypatch):
+        monkeypatch.setattr(backup, "_backup_slots", asyncio.Semaphore(0))
+        statuses = []
+        monkeypatch.setattr(
+            backup.config_store, "update_backup_status",
+            lambda apple_id, **kw: statuses.append(kw["status"]),
+        )
+        started = False
+
+        async def run():
+            nonlocal started
+            started = True
+
+        backup._start_background("a@icloud.com", run)
+        task = backup._running_tasks["a@icloud.com"]
+        await asyncio.sleep(0)
+        await backup.cancel_backup("a@icloud.com")
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert not started
+        assert statuses == ["error"]
+        assert "a@icloud.com" not in backup._running_tasks
+        assert "a@icloud.com" not in backup._queued_backups
+
+    @pytest.mark.asyncio
+    async def test_trigger_rejected_while_scheduled_run_active(self, monkeypatch):
+        monkeypatch.setattr(
+            backup, "require_account_with_config",
+            lambda apple_id, authenticated: ({}, {"backup_drive": True}),
+        )
+        monkeypatch.setattr(backup, "check_token_expiry_for_account", lambda apple_id: None)
+        backup.backup_service._set_progress("sched@icloud.com", {"phase": "drive"})
+        try:
+            with pytest.raises(HTTPException) as exc:
+                await backup.trigger_backup("sched@icloud.com")
+        finally:
+            backup.backup_service._clear_progress("sched@icloud.com")
+        assert exc.value.status_code == 400
+        assert "sched@icloud.com" not in backup._running_tasks
+
+    @pytest.mark.asyncio
+    async def test_status_keeps_finishing_scheduled_run(self, monkeypatch):
+        monkeypatch.setattr(
+            backup.config_store, "get_backup_config", lambda apple_id: {"last_backup_status": "running"},
+        )
+        writes = []
+        monkeypatch.setattr(backup.config_store, "update_backup_status", lambda apple_id, **kw: writes.append(kw))
+        monkeypatch.setattr(scheduler, "_active_jobs", {"sched@icloud.com"})
+        res = await backup.get_backup_status("sched@icloud.com")
+        assert orjson.loads(res.body)["status"] == "running"
+        assert not writes
+
+    @pytest.mark.asyncio
+    async def test_run_all_skips_run_started_during_token_checks(self, monkeypatch):
+        monkeypatch.setattr(
+            backup.config_store, "list_runnable_accounts", lambda: [{"apple_id": "sched@icloud.com"}],
+        )
+        monkeypatch.setattr(
+            backup, "check_token_expiry_for_account",
+            lambda apple_id: backup.backup_service._set_progress(apple_id, {"phase": "drive"}),
+        )
+        marked = []
+        monkeypatch.setattr(backup.config_store, "mark_backups_running", lambda ids, **kw: marked.extend(ids))
+        try:
+            with pytest.raises(HTTPException):
+                await backup.trigger_all_backups()
+        finally:
+            backup.backup_service._clear_progress("sched@icloud.com")
+        assert not marked
+        assert "sched@icloud.com" not in backup._running_tasks
+
+
+class TestRunBackupArgs:
+    def test_from_config(self):
+        from app.services.backup_service import RunBackupArgs
+
+        args = RunBackupArgs.from_config(
+            "a@icloud.com", {"backup_photos": True, "drive_sync_policy": "keep"}, ["Docs"],
+        )
+        assert args.config_id == "a@icloud.com"
+        assert args.backup_photos is True and args.backup_drive is False
+        assert args.drive_folders == ["Docs"]
+        assert args.drive_sync_policy == "keep"
+        assert args.photos_sync_policy == "keep"
+        assert args.contacts_sync_policy == "archive"
@@ -0,0 +1,279 @@
+"""Tests for the JSON config store."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app import config_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_store, "_CONFIG_FILE", tmp_path / "config.json")
+    return tmp_path
+
+
+class TestPersistence:
+    def test_empty_store(self, store):
+        assert config_store.list_accounts() == []
+
+    def test_add_and_reload(self, store):
+        config_store.add_account("a@icloud.com", status="authenticated")
+        data = json.loads((store / "config.json").read_text())
+        assert data["accounts"][0]["apple_id"] == "a@icloud.com"
+        assert config_store.get_account("a@icloud.com")["status"] == "authenticated"
+
+    def test_default_destination(self, store):
+        config_store.add_account("first.last@icloud.com")
+        cfg = config_store.save_backup_config("first.last@icloud.com", {"destination": ""})
+        assert cfg["destination"] == "first_last_at_icloud_com"
+        assert config_store.default_destination("first.last@icloud.com") == cfg["destination"]
+
+    def test_enums_written_as_values(self, store):
+        from app.models import SyncPolicy
+
+        config_store.add_account("a@icloud.com")
+        config_store.save_backup_config("a@icloud.com", {"drive_sync_policy": SyncPolicy.ARCHIVE})
+        data = json.loads((store / "config.json").read_text())
+        assert data["accounts"][0]["backup"]["drive_sync_policy"] == "archive"
+
+    def test_corrupted_file(self, store):
+        (store / "config.json").write_text("{not json")
+        assert config_store.list_accounts() == []
+
+
+class TestLegacyYamlMigration:
+    def test_migrates_yaml(self, store):
+        (store / "config.yaml").write_text(
+            "accounts:\n"
+            "- apple_id: old@icloud.com\n"
+            "  status: authenticated\n"
+            "  backup:\n"
+            "    drive_sync_policy: !!python/object/apply:app.models.SyncPolicy\n"
+            "    - keep\n"
+            "schedule:\n"
+            "  enabled: true\n"
+            "  cron: 0 3 * * *\n"
+        )
+        assert config_store.get_account("old@icloud.com")["status"] == "authenticated"
+        assert config_store.get_backup_config("old@icloud.com")["drive_sync_policy"] == "keep"
+        assert config_store.get_schedule() == {"enabled": True, "cron": "0 3 * * *"}
+        assert (store / "config.json").exists()
+
+    def test_json_takes_precedence(self, store):
+        (store / "config.yaml").write_text("accounts:\n- apple_id: old@icloud.com\n")
+        (store / "config.json").write_text('{"accounts": []}')
+        assert config_store.list_accounts() == []
+
+
+class TestReadCache:
+    def test_unchanged_file_not_reparsed(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.list_accounts()
+        with patch.object(config_store.orjson, "loads", side_effect=AssertionError("re-parsed")):
+            assert config_store.get_account("a@icloud.com") is not None
+
+    def test_external_change_invalidates(self, store):
+        config_store.add_account("a@icloud.com")
+        assert len(config_store.list_accounts()) == 1
+        (store / "config.json").write_text('{"accounts": [{"apple_id": "b@icloud.com"}, {"apple_id": "c@icloud.com"}]}')
+        assert [a["apple_id"] for a in config_store.list_accounts()] == ["b@icloud.com", "c@icloud.com"]
+
+    def test_failed_write_keeps_cache_intact(self, store):
+        config_store.add_account("a@icloud.com", status="pending")
+        with patch.object(config_store, "_write", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                config_store.update_account_status("a@icloud.com", status="authenticated")
+        assert config_store.get_account("a@icloud.com")["status"] == "pending"
+
+    def test_idempotent_write_skipped(self, store):
+        config_store.add_account("a@icloud.com", status="authenticated")
+        with patch.object(config_store, "_write_atomic", side_effect=AssertionError("rewritten")):
+            config_store.update_account_status("a@icloud.com", status="authenticated")
+
+
+class TestStatusFiles:
+    def test_status_update_leaves_config_untouched(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.save_backup_config("a@icloud.com", {"backup_drive": True})
+        before = (store / "config.json").read_bytes()
+        config_store.update_backup_status("a@icloud.com", status="success", started_at="t0")
+        assert (store / "config.json").read_bytes() == before
+        assert (store / "status" / "a@icloud.com.json").exists()
+
+    def test_get_backup_config_merges_status(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.save_backup_config("a@icloud.com", {"backup_drive": True})
+        config_store.update_backup_status("a@icloud.com", status="running", started_at="t0")
+        config_store.update_backup_status("a@icloud.com", status="success", message="ok")
+        cfg = config_store.get_backup_config("a@icloud.com")
+        assert cfg["backup_drive"] is True
+        assert cfg["last_backup_status"] == "success"
+        assert cfg["last_backup_started_at"] == "t0"
+        assert cfg["last_backup_message"] == "ok"
+        assert config_store.list_configured_accounts()[0]["last_backup_status"] == "success"
+
+    def test_legacy_status_in_config_is_read(self, store):
+        (store / "config.json").write_text(
+            '{"accounts": [{"apple_id": "a@icloud.com", "backup": {"last_backup_status": "success"}}]}'
+        )
+        assert config_store.get_backup_config("a@icloud.com")["last_backup_status"] == "success"
+
+    def test_unknown_account_ignored(self, store):
+        config_store.update_backup_status("nobody@icloud.com", status="running")
+        assert not (store / "status").exists()
+
+    def test_delete_removes_status(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.update_backup_status("a@icloud.com", status="success")
+        config_store.delete_account("a@icloud.com")
+        assert not (store / "status" / "a@icloud.com.json").exists()
+
+    def test_final_status_write_is_fsynced(self, store):
+        config_store.add_account("a@icloud.com")
+        with patch.object(config_store.os, "fsync", wraps=config_store.os.fsync) as fsync:
+            config_store.mark_running("a@icloud.com", started_at="2024-01-01T00:00:00+00:00")
+            assert fsync.call_count == 0
+            config_store.update_backup_status("a@icloud.com", status="success")
+        assert fsync.call_count == 1
+        assert config_store.get_backup_config("a@icloud.com")["last_backup_status"] == "success"
+
+    def test_status_served_from_memory(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.update_backup_status("a@icloud.com", status="success")
+        with patch.object(config_store.Path, "read_bytes", side_effect=AssertionError("re-read")):
+            assert config_store.get_backup_config("a@icloud.com")["last_backup_status"] == "success"
+
+    def test_mark_backups_running(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.add_account("b@icloud.com")
+        config_store.mark_backups_running(["a@icloud.com", "b@icloud.com", "nobody@icloud.com"], started_at="t0")
+        assert not (store / "status").exists()
+        for cfg in config_store.list_backup_configs().values():
+            assert cfg["last_backup_status"] == "running"
+            assert cfg["last_backup_started_at"] == "t0"
+
+    def test_running_kept_in_memory(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.mark_running("a@icloud.com", started_at="t0")
+        assert not (store / "status").exists()
+        assert config_store.get_backup_config("a@icloud.com")["last_backup_status"] == "running"
+        config_store.update_backup_status("a@icloud.com", status="success", message="ok")
+        persisted = json.loads((store / "status" / "a@icloud.com.json").read_text())
+        assert persisted["last_backup_status"] == "success"
+        assert persisted["last_backup_started_at"] == "t0"
+
+    def test_reset_stale_running(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.update_backup_status("a@icloud.com", status="running")
+        assert config_store.reset_stale_running_states() == 1
+        assert config_store.get_backup_config("a@icloud.com")["last_backup_status"] == "error"
+
+
+class TestSanitize:
+    def test_plain_data_not_copied(self):
+        data = {"accounts": [{"apple_id": "a", "backup": {"x": [1, 2]}}]}
+        assert config_store._sanitize(data) is data
+
+    def test_nested_enums_flattened_without_touching_input(self):
+        from app.models import SyncPolicy
+
+        data = {"backup": {"policies": [SyncPolicy.KEEP], "p": SyncPolicy.ARCHIVE}}
+        clean = config_store._sanitize(data)
+        assert clean == {"backup": {"policies": ["keep"], "p": "archive"}}
+        assert data["backup"]["p"] is SyncPolicy.ARCHIVE
+
+
+class TestWriteAtomic:
+    def test_directory_created_once(self, tmp_path):
+        target = tmp_path / "sub" / "file.json"
+        config_store._write_atomic(target, b"1")
+        with patch.object(config_store.Path, "mkdir", side_effect=AssertionError("mkdir")):
+            config_store._write_atomic(target, b"2")
+        assert target.read_bytes() == b"2"
+
+    def test_removed_directory_recreated(self, tmp_path):
+        target = tmp_path / "sub" / "file.json"
+        config_store._write_atomic(target, b"1")
+        target.unlink()
+        target.parent.rmdir()
+        config_store._write_atomic(target, b"2")
+        assert target.read_bytes() == b"2"
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path):
+        target = tmp_path / "file.json"
+        with patch.object(config_store.os, "replace", side_effect=OSError("boom")):
+            with pytest.raises(OSError):
+                config_store._write_atomic(target, b"1")
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestListBackupConfigs:
+    def test_keyed_by_apple_id(self, store):
+        config_store.add_account("a@icloud.com")
+        config_store.add_account("b@icloud.com")
+        config_store.save_backup_config("b@icloud.com", {"backup_drive": True})
+        config_store.update_backup_status("b@icloud.com", status="success")
+        configs = config_store.list_backup_configs()
+        assert list(configs) == ["a@icloud.com", "b@icloud.com"]
+        assert configs["a@icloud.com"]["backup_drive"] is False
+        assert configs["b@icloud.com"]["last_backup_status"] == "success"
+
+
+class TestRunnableAccounts:
+    def test_only_authenticated_and_configured(self, store):
+        config_store.add_account("a@icloud.com", status="authenticated")
+        config_store.add_account("b@icloud.com", status="requires_2fa")
+        config_store.add_account("c@icloud.com", status="authenticated")
+        config_store.save_backup_config("a@icloud.com", {"backup_calendar": True})
+        config_store.save_backup_config("b@icloud.com", {"backup_drive": True})
+        runnable = config_store.list_runnable_accounts()
+        assert [cfg["apple_id"] for cfg in runnable] == ["a@icloud.com"]
+        assert runnable[0]["status"] == "authenticated"
+        assert runnable[0]["backup_calendar"] is True
+
+
+class TestDriveFolders:
+    def test_advanced_folders_resolved_on_save(self, store):
+        config_store.add_account("a@icloud.com")
+        cfg = config_store.save_backup_config("a@icloud.com", {
+            "drive_config_mode": "advanced",
+            "drive_folders_simple": ["Ignored"],
+            "drive_folders_advanced": " Documents \n\nPhotos/2024\n",
+        })
+        assert cfg["drive_folders"] == ["Documents", "Photos/2024"]
+        assert config_store.drive_folders(cfg) == ["Documents", "Photos/2024"]
+
+    def test_simple_mode(self, store):
+        config_store.add_account("a@icloud.com")
+        cfg = config_store.save_backup_config("a@icloud.com", {"drive_folders_simple": ["Docs"]})
+        assert config_store.drive_folders(cfg) == ["Docs"]
+
+    def test_backfilled_on_read(self, store):
+        (store / "config.json").write_text(
+            '{"accounts": [{"apple_id": "a@icloud.com", "backup": '
+            '{"drive_config_mode": "advanced", "drive_folders_advanced": "A\\nB"}}]}'
+        )
+        assert config_store.get_backup_config("a@icloud.com")["drive_folders"] == ["A", "B"]
+
+    def test_legacy_config_parsed_on_the_fly(self):
+        cfg = {"drive_config_mode": "advanced", "drive_folders_advanced": "A\nB"}
+        assert config_store.drive_folders(cfg) == ["A", "B"]
+
+
+class TestSharedLibraryOwners:
+    def test_claims_mapped_by_library(self, store):
+        for apple_id, family, lib in (
+            ("a@icloud.com", True, "SharedSync-1"),
+            ("b@icloud.com", False, "SharedSync-2"),
+            ("c@icloud.com", True, "SharedSync-3"),
+        ):
+            config_store.add_account(apple_id)
+            config_store.save_backup_config(apple_id, {"photos_include_family": family, "shared_library_id": lib})
+        assert config_store.get_shared_library_owners() == {
+            "SharedSync-1": "a@icloud.com", "SharedSync-3": "c@icloud.com",
+        }
+        assert config_store.get_shared_library_owners(exclude_apple_id="a@icloud.com") == {
+            "SharedSync-3": "c@icloud.com",
+        }
@@ -1,11 +1,13 @@
 """Tests for etag cache persistence."""
 
 import json
+import threading
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-from app.services.backup_service import _load_cache, _save_cache, _cache_path
+from app.services import backup_service
+from app.services.backup_service import _load_cache, _save_cache, _cache_path, flush_cache_writes
 
 
 @pytest.fixture
@@ -63,3 +65,41 @@ class TestSaveCache:
 
         loaded = _load_cache("dest", "Folder")
         assert loaded == {"new": "data"}
+
+    def test_flush_writes_file_atomically(self, tmp_config):
+        cache_data = {"a": "1"}
+        _save_cache("dest", "Flushed", cache_data)
+        cache_data["b"] = "2"  # changes after saving are not written
+        flush_cache_writes()
+
+        path = _cache_path("dest", "Flushed")
+        assert json.loads(path.read_text()) == {"a": "1"}
+        assert not path.with_name(path.name + ".tmp").exists()
+
+    def test_run_waits_only_for_its_own_writes(self, tmp_config):
+        release = threading.Event()
+        write = backup_service._write_atomic
+
+        def slow_write(path, data, failure_msg):
+            if "Other" in path.name:
+                release.wait(timeout=5)
+            write(path, data, failure_msg)
+
+        def drive_backup(*args, **kwargs):
+            _save_cache("dest", "Own", {"a": "1"})
+            return {"downloaded": 0, "skipped": 0, "errors": 0}
+
+        with patch.object(backup_service, "_write_atomic", slow_write):
+            other = _save_cache("dest", "Other", {"b": "2"})
+            try:
+                with patch.object(backup_service.icloud_service, "get_session", return_value=object()), \
+                        patch.object(backup_service, "run_drive_backup", drive_backup):
+                    backup_service.run_backup(backup_service.RunBackupArgs(
+                        apple_id="a@icloud.com", backup_drive=True, drive_folders=["Own"],
+                    ))
+                assert json.loads(_cache_path("dest", "Own").read_text()) == {"a": "1"}
+                assert other.is_alive()
+            finally:
+                release.set()
+                flush_cache_writes()
+        assert json.loads(_cache_path("dest", "Other").read_text()) == {"b": "2"}
@@ -1,7 +1,7 @@
 """Tests for exclusion pattern matching."""
 
 import pytest
-from app.services.backup_service import is_excluded
+from app.services.backup_service import _is_child_excluded, compile_excludes, is_excluded
 
 
 class TestGlobPatterns:
@@ -63,3 +63,19 @@ class TestCombinedPatterns:
         assert is_excluded("project/node_modules/pkg", excludes)
         assert is_excluded("Documents/Temp/scratch.txt", excludes)
         assert not is_excluded("Documents/Important/file.pdf", excludes)
+
+    def test_compiled_matches_list(self):
+        excludes = [".DS_Store", "*.tmp", "Medien/*", "Documents/Temp"]
+        compiled = compile_excludes(excludes)
+        for path in ("foo/.DS_Store", "a/b.tmp", "Medien/x/y.jpg", "Documents/Temp/a", "Documents/ok.pdf"):
+            assert is_excluded(path, compiled) == is_excluded(path, excludes)
+        assert compile_excludes([]) is None
+        assert compile_excludes(compiled) is compiled
+
+    def test_child_check_matches_full_check(self):
+        excludes = [".DS_Store", "*.tmp", "Medien/*", "Documents/Temp"]
+        compiled = compile_excludes(excludes)
+        for path in ("foo/.DS_Store", "a/b.tmp", "Medien/x", "Documents/Temp", "Documents/ok.pdf", "ok"):
+            name = path.rsplit("/", 1)[-1]
+            assert _is_child_excluded(path, name, compiled) == is_excluded(path, excludes)
+        assert not _is_child_excluded("x.tmp", "x.tmp", None)
@@ -0,0 +1,77 @@
+"""Tests for sharing one pyicloud session between download threads."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from pyicloud.session import PyiCloudSession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.services import icloud_service
+
+
+def _session(tmp_path) -> PyiCloudSession:
+    return PyiCloudSession(
+        service=SimpleNamespace(account_name="a@icloud.com"),
+        client_id="client", cookie_directory=str(tmp_path),
+    )
+
+
+class TestSessionPersistence:
+    def test_saves_are_serialized(self, tmp_path, monkeypatch):
+        session = _session(tmp_path)
+        active = 0
+        peak = 0
+        counter = threading.Lock()
+        save = session._save_session_data
+
+        def tracking_save():
+            nonlocal active, peak
+            with counter:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.001)
+            save()
+            with counter:
+                active -= 1
+
+        session._save_session_data = tracking_save
+        monkeypatch.setattr(icloud_service, "_sessions", {})
+        icloud_service._remember_session("a@icloud.com", SimpleNamespace(session=session))
+
+        def request(i):
+            session.data[f"key{i % 8}"] = "x" * (i % 50)
+            session._save_session_data()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(request, range(200)))
+
+        assert peak == 1
+        with open(session.session_path, encoding="utf-8") as fh:
+            assert json.load(fh)["client_id"] == "client"
+
+    def test_lock_installed_once(self, tmp_path, monkeypatch):
+        session = _session(tmp_path)
+        monkeypatch.setattr(icloud_service, "_sessions", {})
+        api = SimpleNamespace(session=session)
+        icloud_service._remember_session("a@icloud.com", api)
+        wrapped = session._save_session_data
+        icloud_service._remember_session("a@icloud.com", api)
+        assert session._save_session_data is wrapped
+
+
+class TestConnectionPool:
+    def test_pool_enlarged_with_retries_kept(self, tmp_path, monkeypatch):
+        session = _session(tmp_path)
+        retries = Retry(total=3, backoff_factor=0.5)
+        session.mount("https://", HTTPAdapter(max_retries=retries, pool_block=True))
+        monkeypatch.setattr(icloud_service, "_sessions", {})
+        icloud_service._remember_session("a@icloud.com", SimpleNamespace(session=session))
+
+        adapter = session.get_adapter("https://")
+        assert adapter._pool_maxsize == icloud_service._HTTP_POOL_SIZE
+        assert adapter.max_retries is retries
+        assert adapter._pool_block
@@ -0,0 +1,223 @@
+"""Tests for pooled Drive and Photos downloads and local orphan cleanup."""
+
+import io
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services import backup_service
+
+
+class _File:
+    type = "file"
+
+    def __init__(self, content: bytes, etag: str | None = None):
+        self.content = content
+        self.size = len(content)
+        self.date_modified = datetime(2024, 1, 1)
+        # Like pyicloud's DriveNode, the etag is only available in .data
+        self.data = {"drivewsid": "FILE::x", "etag": etag}
+
+
+class _Folder:
+    type = "folder"
+
+    def __init__(self, children: dict, etag: str | None = None):
+        self.children = children
+        self.data = {"etag": etag}
+
+    def get_children(self):
+        for name, child in self.children.items():
+            child.name = name
+        return list(self.children.values())
+
+
+@pytest.fixture
+def drive(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_service.settings, "config_path", tmp_path / "config")
+    monkeypatch.setattr(backup_service.settings, "archive_path", tmp_path / "archive")
+    (tmp_path / "config").mkdir()
+    root = _Folder({
+        "a.txt": _File(b"a" * 10),
+        "sub": _Folder({f"f{i}.txt": _File(b"x" * i) for i in range(1, 30)}),
+    })
+    api = SimpleNamespace(drive={"Docs": root})
+    monkeypatch.setattr(backup_service.icloud_service, "get_session", lambda apple_id: api)
+    monkeypatch.setattr(
+        backup_service, "_open_drive_node",
+        lambda node, rel_path, **kw: SimpleNamespace(raw=io.BytesIO(node.content)),
+    )
+    return tmp_path
+
+
+class TestDriveDownloads:
+    def test_all_files_downloaded(self, drive):
+        stats = backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert stats["downloaded"] == 30
+        assert stats["errors"] == 0
+        assert (drive / "out" / "Docs" / "sub" / "f7.txt").read_bytes() == b"x" * 7
+
+        again = backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert again["downloaded"] == 0
+        assert again["skipped"] == 30
+
+    def test_failed_download_counted(self, drive):
+        def flaky(node, rel_path, **kw):
+            if rel_path == "sub/f3.txt":
+                raise OSError("boom")
+            return SimpleNamespace(raw=io.BytesIO(node.content))
+
+        with patch.object(backup_service, "_open_drive_node", flaky):
+            stats = backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert stats["downloaded"] == 29
+        assert stats["errors"] == 1
+        assert not (drive / "out" / "Docs" / "sub" / "f3.txt.tmp").exists()
+
+    def test_orphans_removed_with_empty_dirs(self, drive):
+        out = drive / "out" / "Docs"
+        (out / "gone" / "deep").mkdir(parents=True)
+        (out / "gone" / "deep" / "old.txt").write_bytes(b"old")
+        (out / "sub" / "partial.txt.tmp").parent.mkdir(parents=True)
+        (out / "sub" / "partial.txt.tmp").write_bytes(b"")
+        stats = backup_service.sync_drive_folder(
+            "a@icloud.com", "Docs", drive / "out", "dest",
+            sync_policy=backup_service.SyncPolicy.DELETE,
+        )
+        assert stats["deleted"] == 1
+        assert not (out / "gone").exists()
+        assert (out / "sub" / "partial.txt.tmp").exists()
+        assert (out / "a.txt").exists()
+
+    def test_unchanged_file_etag_still_restores_missing_file(self, drive, monkeypatch):
+        root = _Folder({"a.txt": _File(b"a", etag="e1"), "b.txt": _File(b"b", etag="e1")})
+        monkeypatch.setattr(
+            backup_service.icloud_service, "get_session", lambda apple_id: SimpleNamespace(drive={"Docs": root}),
+        )
+        backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        (drive / "out" / "Docs" / "a.txt").unlink()
+        with patch.object(backup_service, "_file_needs_update", wraps=backup_service._file_needs_update) as check:
+            stats = backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert stats["downloaded"] == 1
+        assert stats["skipped"] == 1
+        # b.txt is skipped by its etag; only the missing a.txt is checked
+        assert check.call_count == 1
+        assert (drive / "out" / "Docs" / "a.txt").read_bytes() == b"a"
+
+    def test_etag_cache_drops_deleted_files(self, drive, monkeypatch):
+        sub = _Folder({"x.txt": _File(b"x", etag="e1")}, etag="f1")
+        root = _Folder({"a.txt": _File(b"a", etag="e1"), "b.txt": _File(b"b", etag="e1"), "sub": sub})
+        monkeypatch.setattr(
+            backup_service.icloud_service, "get_session", lambda apple_id: SimpleNamespace(drive={"Docs": root}),
+        )
+        backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        del root.children["b.txt"]
+        backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        cache = backup_service._load_cache("dest", "Docs")
+        assert "b.txt" not in cache
+        # Entries below a folder skipped by its etag are kept
+        assert cache["sub"] == "f1"
+        assert cache["sub/x.txt"] == "e1"
+
+    def test_package_size_cache_skips_redownload(self, drive, monkeypatch):
+        package = _File(b"zipped-bundle")
+        package.size = 4096  # metadata size of the unpacked bundle
+        root = _Folder({"Disk.sparsebundle": package})
+        monkeypatch.setattr(
+            backup_service.icloud_service, "get_session", lambda apple_id: SimpleNamespace(drive={"Docs": root}),
+        )
+        assert backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")["downloaded"] == 1
+        stats = backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert stats["downloaded"] == 0
+        assert stats["skipped"] == 1
+
+    def test_unchanged_folder_does_not_rewrite_cache(self, drive, monkeypatch):
+        root = _Folder({"a.txt": _File(b"a", etag="e1")})
+        monkeypatch.setattr(
+            backup_service.icloud_service, "get_session", lambda apple_id: SimpleNamespace(drive={"Docs": root}),
+        )
+        with patch.object(backup_service, "_save_cache", wraps=backup_service._save_cache) as save:
+            backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+            backup_service.sync_drive_folder("a@icloud.com", "Docs", drive / "out", "dest")
+        assert save.call_count == 1
+
+    def test_walk_yields_folder_etag_after_its_files(self):
+        sub = _Folder({"x.txt": _File(b"x")}, etag="f1")
+        root = _Folder({"sub": sub, "top.txt": _File(b"t")})
+        walked = list(backup_service._walk_remote(root, cache={}))
+        assert [rel for rel, _, _ in walked] == ["top.txt", "sub/x.txt", "sub"]
+        assert walked[-1][1:] == (None, "f1")
+        assert list(backup_service._walk_remote(root, cache={"sub": "f1"}))[0][0] == "top.txt"
+        assert len(list(backup_service._walk_remote(root, cache={"sub": "f1"}))) == 1
+
+
+class TestPhotoDownloads:
+    def test_same_name_photos_get_distinct_paths(self, tmp_path):
+        photos = [
+            SimpleNamespace(filename="IMG.jpg", id=f"p{i}", size=i + 1, asset_date=datetime(2024, 5, 1))
+            for i in range(3)
+        ]
+        targets = []
+
+        def fake_download(photo, local_path, config_id=None):
+            targets.append(local_path)
+            local_path.write_bytes(b"x" * photo.size)
+            return True
+
+        stats = {"downloaded": 0, "skipped": 0, "deleted": 0, "archived": 0, "errors": 0}
+        with patch.object(backup_service, "_download_photo", fake_download):
+            backup_service._backup_photo_library(
+                None, photos, tmp_path, "Mediathek", None, stats, False, None,
+                backup_service.SyncPolicy.KEEP, tmp_path / "archive",
+            )
+        assert stats["downloaded"] == 3
+        assert len(set(targets)) == 3
+
+    def test_photo_cache_checkpointed_during_run(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(backup_service.settings, "config_path", tmp_path)
+        monkeypatch.setattr(backup_service, "_PHOTO_CACHE_CHECKPOINT", 2)
+        monkeypatch.setattr(backup_service, "_photo_fingerprint", lambda photo: f"fp-{photo.id}")
+        saved = []
+        monkeypatch.setattr(
+            backup_service, "_save_photo_cache", lambda dest, label, cache: saved.append(len(cache)),
+        )
+        photos = [
+            SimpleNamespace(filename=f"IMG{i}.jpg", id=f"p{i}", size=1, asset_date=datetime(2024, 5, 1))
+            for i in range(5)
+        ]
+
+        def fake_download(photo, local_path, config_id=None):
+            local_path.write_bytes(b"x")
+            return True
+
+        stats = {"downloaded": 0, "skipped": 0, "deleted": 0, "archived": 0, "errors": 0}
+        with patch.object(backup_service, "_download_photo", fake_download):
+            backup_service._backup_photo_library(
+                None, photos, tmp_path / "out", "Mediathek", None, stats, False, None,
+                backup_service.SyncPolicy.KEEP, tmp_path / "archive", destination="dest",
+            )
+        assert stats["downloaded"] == 5
+        assert saved[-1] == 5
+        assert len(saved) >= 2
+
+    def test_download_not_started_after_cancel(self, tmp_path):
+        backup_service._register_cancel_event("c@icloud.com")
+        backup_service.request_cancel("c@icloud.com")
+        try:
+            with pytest.raises(backup_service.BackupCancelled):
+                backup_service._download_photo(SimpleNamespace(filename="a.jpg"), tmp_path / "a.jpg", "c@icloud.com")
+        finally:
+            backup_service._clear_progress("c@icloud.com")
+        assert not (tmp_path / "a.jpg").exists()
+
+
+class TestUniquePath:
+    def test_free_path_returned(self, tmp_path):
+        assert backup_service._unique_path(tmp_path / "a.jpg") == tmp_path / "a.jpg"
+
+    def test_skips_existing_and_taken(self, tmp_path):
+        for name in ("a.jpg", "a_1.jpg", "a_2.jpg"):
+            (tmp_path / name).write_bytes(b"")
+        taken = {tmp_path / "a_3.jpg"}
+        assert backup_service._unique_path(tmp_path / "a.jpg", taken) == tmp_path / "a_4.jpg"
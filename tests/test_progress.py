@@ -1,6 +1,9 @@
 """Tests for backup progress tracking."""
 
-from app.services.backup_service import get_progress, _set_progress, _clear_progress
+from app.services.backup_service import (
+    _clear_progress, _is_cancelled, _progress_due, _register_cancel_event, _set_progress, get_progress,
+    request_cancel,
+)
 
 
 class TestProgress:
@@ -30,3 +33,24 @@ class TestProgress:
         result = get_progress(102)
         assert result["downloaded"] == 2
         _clear_progress(102)
+
+
+class TestCancelFlags:
+    def test_cancel_only_while_registered(self):
+        assert not request_cancel("cancel@icloud.com")
+        _register_cancel_event("cancel@icloud.com")
+        assert not _is_cancelled("cancel@icloud.com")
+        assert request_cancel("cancel@icloud.com")
+        assert _is_cancelled("cancel@icloud.com")
+        _clear_progress("cancel@icloud.com")
+        assert not _is_cancelled("cancel@icloud.com")
+        assert not request_cancel("cancel@icloud.com")
+
+
+class TestProgressThrottle:
+    def test_due_at_most_every_interval(self):
+        assert _progress_due("throttle@icloud.com")
+        assert not _progress_due("throttle@icloud.com")
+        _clear_progress("throttle@icloud.com")
+        assert _progress_due("throttle@icloud.com")
+        _clear_progress("throttle@icloud.com")
@@ -0,0 +1,33 @@
+"""Tests for local backup storage statistics."""
+
+import pytest
+
+from app.services import backup_service
+
+
+@pytest.fixture
+def backup_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_service.settings, "backup_path", tmp_path)
+    return tmp_path
+
+
+class TestStorageStats:
+    def test_counts_nested_files(self, backup_root):
+        photos = backup_root / "dest" / "photos"
+        (photos / "2024" / "01").mkdir(parents=True)
+        (photos / "top.jpg").write_bytes(b"x" * 10)
+        (photos / "2024" / "a.jpg").write_bytes(b"x" * 5)
+        (photos / "2024" / "01" / "b.jpg").write_bytes(b"x" * 7)
+        (backup_root / "dest" / "drive").mkdir()
+        (backup_root / "dest" / "drive" / "doc.txt").write_bytes(b"x" * 3)
+
+        stats = backup_service.get_backup_storage_stats("dest")
+        assert stats["photos"] == {"count": 3, "size_bytes": 22}
+        assert stats["drive"] == {"count": 1, "size_bytes": 3}
+
+    def test_missing_categories_are_zero(self, backup_root):
+        stats = backup_service.get_backup_storage_stats("nothing-here")
+        assert stats == {
+            name: {"count": 0, "size_bytes": 0}
+            for name in ("photos", "drive", "contacts", "calendar")
+        }